@@ -5,7 +5,18 @@ Example of using functional operations in KMR chains
 
 from kmr_chains import get_default_space
 from kmr_chains_operations_init import initialize_functional_operations
-from kmr_chains_operations_func import evaluate_function_chain, create_kmr_function
+import numpy as np
+
+from kmr_chains_operations_func import (
+    evaluate_function_chain,
+    evaluate_function_chain_vectorized,
+    save_function,
+    load_function,
+    FunctionEvaluationCache,
+    create_chain_function,
+    create_kmr_function,
+)
+from kmr_sampling import sample_function_chain, evaluate_piecewise, RECIPROCAL
 
 # Initialize functional operations in the space
 space = get_default_space()
@@ -162,6 +173,65 @@ for x in [0, 1, 2, 5, 10]:
     result = evaluate_function_chain(safe4, space, x)
     print(f"f({x}) = {result:.3f}")
 
+print("\n=== Example 13: Vectorized evaluation on a grid ===")
+
+# The whole chain runs once on the array; points on a pole are reported
+inv_kmr2 = add_element('⊘f', 2, parent_id=add_element('identity', lambda x: x))
+grid = np.linspace(0.0, 1.0, 11)
+result = evaluate_function_chain_vectorized(inv_kmr2, space, grid)
+print(f"f(x) = x ⊘ 2 on {grid.size} points of [0, 1]")
+print(f"Vectorized: {result['vectorized']}")
+print(f"Values: {np.round(result['values'], 3)}")
+print(f"Poles at x = {grid[result['poles']]}")
+
+sin_chain = add_element('⊙f', 0.5, parent_id=add_element('identity', 'sin'))
+result = evaluate_function_chain_vectorized(sin_chain, space, np.linspace(-np.pi, np.pi, 1_000_000))
+print(f"sin(x) ⊙ 0.5 on 1,000,000 points: vectorized={result['vectorized']}, poles={result['poles'].size}")
+
+print("\n=== Example 14: Serializable chain values ===")
+
+# Chain values are FunctionNode trees: they pickle as long as every leaf does
+# (basic functions, expressions and constants do; lambdas do not)
+import os
+import tempfile
+
+p1 = add_element('identity', 'identity')
+p2 = add_element('⊙f', 2, parent_id=p1)
+p3 = add_element('+f', 'sin(x)^2', parent_id=p2)
+node = space.get_chain_value(p3)
+print(f"Chain value: {node}")
+
+path = os.path.join(tempfile.mkdtemp(), 'chain.pkl')
+save_function(node, path)
+restored = load_function(path)
+print(f"Restored from disk: f(0.5) = {restored(0.5):.6f} (original {node(0.5):.6f})")
+
+print("\n=== Example 15: Memoized evaluation ===")
+
+# Repeated evaluations at the same points are answered from an LRU cache
+cache = FunctionEvaluationCache(space, maxsize=128)
+dashboard = create_chain_function(safe4, space, cache=cache)
+grid = np.linspace(0.0, 10.0, 1000)
+for _ in range(10):
+    values = dashboard(grid)
+    center = dashboard(5.0)
+print(f"f(5) = {center:.3f}, f on a 1000-point grid: {values[:3].round(3)} ...")
+stats = cache.stats()
+print(f"Cache: {stats['hits']} hits, {stats['misses']} misses, hit rate {stats['hit_rate']:.0%}")
+
+print("\n=== Example 16: Adaptive sampling near poles ===")
+
+# Points are spent where the chain bends or blows up; near a pole the
+# reciprocal of the value is interpolated linearly
+sin_pole = add_element('⊙f', 2, parent_id=add_element('identity', 'sin'))
+sampling = sample_function_chain(sin_pole, space, -4.0, 4.0, tol=1e-4)
+print(f"f(x) = sin(x) ⊙ 2 on [-4, 4]: {sampling['evaluations']} evaluations, "
+      f"{sampling['x'].size} samples, {np.count_nonzero(sampling['modes'] == RECIPROCAL)} reciprocal intervals")
+print(f"Poles (1 + 2·sin(x) = 0): {np.round(sampling['poles'], 6)}")
+check = np.array([-3.0, -1.0, 0.0, 2.0])
+print(f"Piecewise f({check}) = {np.round(evaluate_piecewise(sampling, check), 5)}")
+print(f"Exact     f({check}) = {np.round(evaluate_function_chain_vectorized(sin_pole, space, check)['values'], 5)}")
+
 print("\n=== Summary ===")
 print(f"Total elements in space: {len(space.public_heap)}")
 print("All operations completed successfully!")
\ No newline at end of file
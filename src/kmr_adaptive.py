@@ -0,0 +1,241 @@
+# kmr_adaptive.py
+"""
+KMR Adaptive Precision - float64 first, exact re-evaluation only where needed
+Version: 1.0.0
+License: GPL 3.0 (see LICENSE)
+Author: Sergei Terikhov
+
+Batches are evaluated in float64 while a first-order relative error bound
+is propagated alongside. For a step x -> x ⊙ K with d = 1 + K·x:
+
+    relative condition      (1 + |K·x|) / |d|
+    error propagated        err_{i} = err_{i-1} / |d| + u·(2 + (1 + |K·x|) / |d|)
+
+Elements whose bound exceeds the requested tolerance are re-evaluated
+in exact rational arithmetic (fractions.Fraction) or in mpmath.
+"""
+
+from fractions import Fraction
+from typing import Any, Dict
+import numpy as np
+
+from kmr_operations import _kmr_base_batch
+
+# Unit roundoff of float64
+_U = np.finfo(float).eps / 2
+
+
+# ========== CONDITION ESTIMATES ==========
+
+def step_condition(x: Any, K: Any) -> Any:
+    """
+    Relative condition number of x ⊙ K: (1 + |K·x|) / |1 + K·x|
+
+    Works on floats and arrays; returns inf at a pole.
+    """
+    x = np.asarray(x, dtype=float)
+    K = np.asarray(K, dtype=float)
+    kx = K * x
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cond = (1.0 + np.abs(kx)) / np.abs(1.0 + kx)
+    return np.where(np.isnan(cond), np.inf, cond)
+
+
+def _float_step(x: np.ndarray, K: np.ndarray, err: np.ndarray, sign: float):
+    """One vectorized ⊙ (sign=+1) or ⊘ (sign=-1) step with error propagation"""
+    kx = sign * K * x
+    d = 1.0 + kx
+    abs_d = np.abs(d)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        y = x / d
+        err = err / abs_d + _U * (2.0 + (1.0 + np.abs(kx)) / abs_d)
+    # kmr_direct_sh convention: 0 ⊙ K = 0
+    zero = x == 0
+    y = np.where(zero, 0.0, y)
+    err = np.where(zero, 0.0, err)
+    err = np.where(np.isfinite(y), err, np.inf)
+    return y, err
+
+
+def _exact_apply(x, steps, backend: str, dps: int):
+    """Exact (Fraction) or mpmath evaluation of x followed by (sign, K) steps"""
+    if backend == 'fraction':
+        x = Fraction(x)
+        for sign, K in steps:
+            if x == 0:
+                continue
+            d = 1 + K * x if sign > 0 else 1 - K * x
+            if d == 0:
+                return float('nan')
+            x = x / d
+        return x
+
+    if backend == 'mpmath':
+        import mpmath
+        with mpmath.workdps(dps):
+            x = mpmath.mpf(x)
+            for sign, K in steps:
+                if x == 0:
+                    continue
+                if isinstance(K, Fraction):
+                    K = mpmath.mpf(K.numerator) / K.denominator
+                d = 1 + K * x if sign > 0 else 1 - K * x
+                if d == 0:
+                    return float('nan')
+                x = x / d
+            return x
+
+    raise ValueError(f"Unknown backend: {backend}")
+
+
+def _result(values, err, escalated) -> Dict[str, Any]:
+    return {
+        'values': values,
+        'error_bound': err,
+        'escalated': escalated,
+        'escalated_count': int(np.count_nonzero(escalated)),
+        'total': int(values.size),
+    }
+
+
+# ========== ADAPTIVE CHAIN EVALUATION ==========
+
+def adaptive_compute_chain(elements, rtol: float = 1e-12,
+                           backend: str = 'fraction', dps: int = 50) -> Dict[str, Any]:
+    """
+    Evaluate many chains A1 ⊙ ... ⊙ An, escalating ill-conditioned rows
+
+    Args:
+        elements: Array of shape (batch, n); row i is the chain A1..An
+        rtol: Relative error bound above which a row is re-evaluated
+        backend: 'fraction' (exact) or 'mpmath'
+        dps: Decimal digits for the mpmath backend
+
+    Returns:
+        Dictionary with 'values', 'error_bound', 'escalated' (mask),
+        'escalated_count' and 'total'
+    """
+    elements = np.atleast_2d(np.asarray(elements, dtype=float))
+    x = elements[:, 0].copy()
+    err = np.zeros_like(x)
+    for j in range(1, elements.shape[1]):
+        x, err = _float_step(x, elements[:, j], err, 1.0)
+
+    escalated = ~(err <= rtol)
+    for i in np.flatnonzero(escalated):
+        row = elements[i]
+        steps = [(1, Fraction(K)) for K in row[1:]]
+        x[i] = float(_exact_apply(row[0], steps, backend, dps))
+        err[i] = _U
+
+    return _result(x, err, escalated)
+
+
+def adaptive_extract_first_element(X, elements, rtol: float = 1e-12,
+                                   backend: str = 'fraction', dps: int = 50) -> Dict[str, Any]:
+    """
+    Batched A1 = X ⊘ An ⊘ ... ⊘ A2 with escalation of ill-conditioned rows
+
+    Args:
+        X: Chain results, shape (batch,)
+        elements: Known elements A2..An, shape (batch, n-1)
+
+    Returns:
+        Dictionary as in adaptive_compute_chain
+    """
+    x = np.atleast_1d(np.asarray(X, dtype=float)).copy()
+    elements = np.atleast_2d(np.asarray(elements, dtype=float))
+    err = np.zeros_like(x)
+    for j in reversed(range(elements.shape[1])):
+        x, err = _float_step(x, elements[:, j], err, -1.0)
+
+    escalated = ~(err <= rtol)
+    for i in np.flatnonzero(escalated):
+        steps = [(-1, Fraction(K)) for K in reversed(elements[i])]
+        x[i] = float(_exact_apply(float(np.atleast_1d(X)[i]), steps, backend, dps))
+        err[i] = _U
+
+    return _result(x, err, escalated)
+
+
+# ========== ADAPTIVE ADDITION / SUBTRACTION ==========
+
+def _adaptive_arith(A, K, C, first_sign: float, rtol: float, backend: str,
+                    dps: int, eps: float) -> Dict[str, Any]:
+    scalar = all(np.ndim(v) == 0 for v in (A, K, C))
+    A, K, C = np.broadcast_arrays(*(np.atleast_1d(np.asarray(v, dtype=float)) for v in (A, K, C)))
+    A = _kmr_base_batch(A, eps)
+    inv_A = 1.0 / A
+
+    X, err = _float_step(A, K, np.zeros_like(A), first_sign)
+    Y, err = _float_step(X, C, err, 1.0)
+    # Rounding of 1/A enters as a parameter error of the last step
+    with np.errstate(divide='ignore', invalid='ignore'):
+        k_term = np.abs(inv_A * Y / (1.0 - inv_A * Y)) * _U
+    Z, err = _float_step(Y, inv_A, err + k_term, -1.0)
+    with np.errstate(divide='ignore'):
+        values = first_sign / Z
+    err = err + _U
+
+    escalated = ~(err <= rtol)
+    for idx in zip(*np.nonzero(escalated)):
+        a = Fraction(float(A[idx]))
+        steps = [(first_sign, Fraction(float(K[idx]))),
+                 (1, Fraction(float(C[idx]))),
+                 (-1, 1 / a)]
+        z = _exact_apply(float(A[idx]), steps, backend, dps)
+        values[idx] = float(first_sign / z) if z != 0 else float('nan')
+        err[idx] = _U
+
+    result = _result(values, err, escalated)
+    if scalar:
+        result.update(values=float(values[0]), error_bound=float(err[0]), escalated=bool(escalated[0]))
+    return result
+
+
+def adaptive_add(A, K, C, rtol: float = 1e-12, backend: str = 'fraction',
+                 dps: int = 50, eps: float = 1e-12) -> Dict[str, Any]:
+    """
+    Batched kmr_add(A, K, C) with escalation of ill-conditioned elements
+
+    Small A makes the final ⊘ A⁻¹ step cancel catastrophically; only
+    those elements are recomputed exactly.
+
+    Returns:
+        Dictionary as in adaptive_compute_chain; 'values', 'error_bound'
+        and 'escalated' are scalars when A, K and C are
+    """
+    return _adaptive_arith(A, K, C, 1.0, rtol, backend, dps, eps)
+
+
+def adaptive_sub(A, K, C, rtol: float = 1e-12, backend: str = 'fraction',
+                 dps: int = 50, eps: float = 1e-12) -> Dict[str, Any]:
+    """Batched kmr_sub(A, K, C) with escalation of ill-conditioned elements"""
+    return _adaptive_arith(A, K, C, -1.0, rtol, backend, dps, eps)
+
+
+def escalation_report(result: Dict[str, Any]) -> str:
+    """One-line summary of an adaptive evaluation"""
+    total = result['total']
+    count = result['escalated_count']
+    share = count / total if total else 0.0
+    return f"escalated {count} of {total} elements ({share:.2%})"
+
+
+if __name__ == "__main__":
+    print("=== KMR Adaptive Precision ===")
+    A = np.array([1.0, 0.5, 0.1, 1e-6, 1e-12])
+    for backend in ('fraction', 'mpmath'):
+        result = adaptive_add(A, 3.0, 2.0, backend=backend)
+        print(f"kmr_add (backend={backend}): {result['values']}")
+        print(f"  {escalation_report(result)}")
+
+    rng = np.random.default_rng(0)
+    chains = rng.uniform(0.1, 5.0, size=(1000, 20))
+    # Drive every 100th row close to a pole at the last step
+    prefix = chains[::100, 0]
+    for j in range(1, chains.shape[1] - 1):
+        prefix = prefix / (1.0 + chains[::100, j] * prefix)
+    chains[::100, -1] = -(1.0 + 1e-9) / prefix
+    result = adaptive_compute_chain(chains)
+    print(f"compute_chain: {escalation_report(result)}")
@@ -7,7 +7,12 @@ Author: Sergei Terikhov
 """
 
 import hashlib
+import math
+import numbers
+import operator
 import secrets
+import sys
+import time
 from typing import Any, Dict
 from kmr_operations import kmr_dircly, kmr_invly
 
@@ -43,15 +48,54 @@ class PrivateChainElement:
         }
 
 
+# Intern key of steps added without a parent
+_ROOT = object()
+
+
+def _intern_part(value: Any) -> tuple:
+    """
+    Exact identity of a step value for the intern table: 1, 1.0 and True
+    differ by type, 0.0 and -0.0 by their hex form, and all NaNs are equal
+    """
+    if isinstance(value, float):
+        return type(value), value.hex()
+    return type(value), value
+
+# Methods replaced on the instance while instrumentation is enabled
+_INSTRUMENTED_METHODS = ('_apply_operation', '_generate_id', '_generate_ids', '_count_tunneling_shortcuts')
+
+
 class KMRChainSpace:
     """KMR Chain Space with abstract minimal design"""
 
-    def __init__(self):
+    def __init__(self, tunneling_shortcut: bool = False, interning: bool = False,
+                 instrumentation: bool = False):
+        """
+        Args:
+            tunneling_shortcut: Evaluate the pattern Y ⊙ X ⊘ Y⁻¹ as X⁻¹
+                at insert time instead of step by step
+            interning: Hash-cons steps in add_element: a step identical to
+                an existing one (same parent, operation, value and
+                chain_value_before) returns the existing element
+            instrumentation: Record hot-path statistics from the start
+                (see enable_instrumentation)
+        """
         self.public_heap: dict[str, PublicChainElement] = {}
         self.private_heap: dict[str, PrivateChainElement] = {}
         self._operation_handlers = {}
         self._operation_aliases = {}
+        self.tunneling_shortcut = tunneling_shortcut
+        self.tunneling_shortcuts = 0
+        self.interning = interning
+        self._intern_table: dict[tuple, str] = {}
+        self.intern_lookups = 0
+        self.intern_reused_elements = 0
+        self.intern_reused_values = 0
+        self._instrumentation = None
+        self._instrumentation_callback = None
         self._register_default_handlers()
+        if instrumentation:
+            self.enable_instrumentation()
 
     def _register_default_handlers(self):
         """Register default operation handlers"""
@@ -60,10 +104,10 @@ class KMRChainSpace:
         self.register_operation('⊘', kmr_invly, {'invly': '⊘', 'inverse': '⊘', 'inv': '⊘'})
 
         # Basic arithmetic operations
-        self.register_operation('+', lambda a, b: a + b, {'add': '+'})
-        self.register_operation('-', lambda a, b: a - b, {'sub': '-'})
-        self.register_operation('*', lambda a, b: a * b, {'mul': '*'})
-        self.register_operation('/', lambda a, b: a / b, {'div': '/'})
+        self.register_operation('+', operator.add, {'add': '+'})
+        self.register_operation('-', operator.sub, {'sub': '-'})
+        self.register_operation('*', operator.mul, {'mul': '*'})
+        self.register_operation('/', operator.truediv, {'div': '/'})
 
     def register_operation(self, op_symbol: str, handler, op_map: Dict = None):
         """Register custom operation handler for any object type"""
@@ -73,6 +117,15 @@ class KMRChainSpace:
             for alias, target_op in op_map.items():
                 self._operation_aliases[alias.lower()] = target_op
 
+        # Interned steps were evaluated with the previous handlers
+        self._intern_table.clear()
+
+    def _resolve_operation(self, operation: str) -> str:
+        """Map operation alias to registered operation symbol"""
+        if operation.lower() in self._operation_aliases:
+            return self._operation_aliases[operation.lower()]
+        return operation
+
     def _apply_operation(self, value_before: Any, operation: str, parameter: Any) -> Any:
         """Apply operation to value - returns result or raises exception"""
         if operation not in self._operation_handlers:
@@ -84,10 +137,214 @@ class KMRChainSpace:
         except Exception as e:
             raise ValueError(f"Operation {operation} failed: {str(e)}")
 
+    def _tunneling_shortcut_value(self, parent_id: str, parameter: Any) -> Any:
+        """
+        Return X⁻¹ if the new ⊘ step closes a tunnel Y ⊙ X ⊘ Y⁻¹, else None
+
+        The parent must be a ⊙ X step with chain_value_before Y, the
+        parameter must be exactly Y⁻¹, and both operators must be the
+        default numeric handlers.
+        """
+        parent = self.private_heap.get(parent_id)
+        if parent is None or self.public_heap[parent_id].operation != '⊙':
+            return None
+        if self._operation_handlers.get('⊙') is not kmr_dircly or \
+                self._operation_handlers.get('⊘') is not kmr_invly:
+            return None
+
+        X = self.public_heap[parent_id].value
+        Y = parent.chain_value_before
+        if not all(isinstance(v, numbers.Real) for v in (X, Y, parameter)):
+            return None
+        if X == 0 or Y == 0:
+            return None
+        if parameter != 1.0 / Y and parameter * Y != 1:
+            return None
+
+        self._count_tunneling_shortcuts(1)
+        return 1.0 / X
+
+    def _count_tunneling_shortcuts(self, count: int) -> None:
+        """Count shortcuts taken (single steps and bulk tunneling chains)"""
+        self.tunneling_shortcuts += count
+
+    def _intern_key(self, parent_id: str, operation: str, value: Any, before_value: Any):
+        """Key of a step for interning, None if it cannot be hashed"""
+        key = (_ROOT if parent_id is None else parent_id, operation,
+               _intern_part(value), _intern_part(before_value))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def interning_stats(self) -> dict:
+        """
+        Deduplication report of the interning mode
+
+        Returns:
+            Dictionary with keys:
+                'lookups': add_element calls that were looked up
+                'reused_elements': calls answered with an existing element
+                'reused_values': calls with an explicit element_id that
+                    reused an existing chain_value_after (not re-evaluated)
+                'stored': elements in the space
+                'dedup_ratio': lookups per element they stored
+                'memory_saved_bytes': reused elements times the mean size
+                    of the stored elements (measured over the whole heap)
+        """
+        interned = self.intern_lookups - self.intern_reused_elements
+        stored = len(self.public_heap)
+        element_size = sum(map(self._element_size, self.public_heap)) / stored if stored else 0
+        return {
+            'lookups': self.intern_lookups,
+            'reused_elements': self.intern_reused_elements,
+            'reused_values': self.intern_reused_values,
+            'stored': stored,
+            'dedup_ratio': self.intern_lookups / interned if interned else 1.0,
+            'memory_saved_bytes': int(self.intern_reused_elements * element_size),
+        }
+
+    def _element_size(self, element_id: str) -> int:
+        """Approximate memory of one element: both parts, their attributes and the ID"""
+        size = sys.getsizeof(element_id)
+        for part in (self.public_heap[element_id], self.private_heap[element_id]):
+            size += sys.getsizeof(part) + sys.getsizeof(part.__dict__)
+            size += sum(sys.getsizeof(v) for k, v in vars(part).items() if k != 'id')
+        return size
+
     def _generate_id(self) -> str:
         """Generate unique ID"""
         return hashlib.sha256(secrets.token_bytes(32)).hexdigest()[:32]
 
+    def _generate_ids(self, count: int) -> list:
+        """Generate many unique IDs at once (bulk inserts)"""
+        raw = secrets.token_bytes(16 * count).hex()
+        return [raw[i:i + 32] for i in range(0, 32 * count, 32)]
+
+    def enable_instrumentation(self, callback=None) -> None:
+        """
+        Start recording hot-path statistics (see instrumentation_stats)
+
+        Timed versions of _apply_operation, _generate_id(s) and the
+        tunneling shortcut counter are installed on this instance only;
+        a space without instrumentation runs the plain methods and pays
+        nothing. Enabling again resets the statistics.
+
+        Args:
+            callback: Optional hook called as callback(event, operation, value)
+                for every recorded event, e.g. to feed Prometheus-style
+                counters:
+                    'operation'          handler seconds of one call
+                    'exception'          1 per failed handler call
+                    'pole'               1 per infinite numeric result
+                    'nan'                1 per NaN numeric result (the
+                                         scalar ⊙/⊘ return NaN on a pole)
+                    'id_generation'      seconds per call, operation None
+                    'tunneling_shortcut' number of shortcuts, operation '⊘'
+        """
+        self._instrumentation = {
+            'operations': {},
+            'handler_time': {},
+            'exceptions': {},
+            'poles': {},
+            'nans': {},
+            'ids_generated': 0,
+            'id_generation_time': 0.0,
+            'tunneling_shortcuts': 0,
+        }
+        self._instrumentation_callback = callback
+        self._apply_operation = self._apply_operation_instrumented
+        self._generate_id = self._generate_id_instrumented
+        self._generate_ids = self._generate_ids_instrumented
+        self._count_tunneling_shortcuts = self._count_tunneling_shortcuts_instrumented
+
+    def disable_instrumentation(self) -> None:
+        """Restore the plain hot-path methods; recorded statistics are dropped"""
+        for name in _INSTRUMENTED_METHODS:
+            self.__dict__.pop(name, None)
+        self._instrumentation = None
+        self._instrumentation_callback = None
+
+    def instrumentation_stats(self) -> dict:
+        """
+        Snapshot of the statistics recorded since enable_instrumentation
+
+        Returns:
+            Dictionary with keys:
+                'enabled': whether instrumentation is on (all other keys
+                    are empty or zero when it is off)
+                'operations': handler calls per resolved operation
+                'handler_time': cumulative handler seconds per operation
+                'exceptions': failed handler calls per operation
+                'poles', 'nans': infinite / NaN results per operation
+                'ids_generated', 'id_generation_time': generated IDs and
+                    seconds spent generating them
+                'tunneling_shortcuts': shortcuts taken while enabled
+                    ('tunneling_shortcuts_total' counts all of them)
+        """
+        stats = self._instrumentation
+        if stats is None:
+            snapshot = {'enabled': False, 'operations': {}, 'handler_time': {}, 'exceptions': {},
+                        'poles': {}, 'nans': {}, 'ids_generated': 0, 'id_generation_time': 0.0,
+                        'tunneling_shortcuts': 0}
+        else:
+            snapshot = {key: dict(value) if isinstance(value, dict) else value for key, value in stats.items()}
+            snapshot['enabled'] = True
+        snapshot['tunneling_shortcuts_total'] = self.tunneling_shortcuts
+        return snapshot
+
+    def _record(self, event: str, operation: Any, value: float) -> None:
+        """Add one event to the statistics and pass it to the callback"""
+        stats = self._instrumentation
+        if event == 'operation':
+            stats['operations'][operation] = stats['operations'].get(operation, 0) + 1
+            stats['handler_time'][operation] = stats['handler_time'].get(operation, 0.0) + value
+        elif event == 'id_generation':
+            stats['id_generation_time'] += value
+        elif event == 'tunneling_shortcut':
+            stats['tunneling_shortcuts'] += value
+        else:
+            counter = stats[event + 's']
+            counter[operation] = counter.get(operation, 0) + value
+        if self._instrumentation_callback is not None:
+            self._instrumentation_callback(event, operation, value)
+
+    def _apply_operation_instrumented(self, value_before: Any, operation: str, parameter: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            result = KMRChainSpace._apply_operation(self, value_before, operation, parameter)
+        except Exception:
+            self._record('exception', operation, 1)
+            raise
+        finally:
+            self._record('operation', operation, time.perf_counter() - start)
+        if isinstance(result, numbers.Real):
+            # Comparisons instead of math.isnan: exact results may not fit a float
+            if result != result:
+                self._record('nan', operation, 1)
+            elif result == math.inf or result == -math.inf:
+                self._record('pole', operation, 1)
+        return result
+
+    def _generate_id_instrumented(self) -> str:
+        start = time.perf_counter()
+        element_id = KMRChainSpace._generate_id(self)
+        self._instrumentation['ids_generated'] += 1
+        self._record('id_generation', None, time.perf_counter() - start)
+        return element_id
+
+    def _generate_ids_instrumented(self, count: int) -> list:
+        start = time.perf_counter()
+        ids = KMRChainSpace._generate_ids(self, count)
+        self._instrumentation['ids_generated'] += count
+        self._record('id_generation', None, time.perf_counter() - start)
+        return ids
+
+    def _count_tunneling_shortcuts_instrumented(self, count: int) -> None:
+        KMRChainSpace._count_tunneling_shortcuts(self, count)
+        self._record('tunneling_shortcut', '⊘', count)
+
     def _get_chain_value_before(self, parent_id: str, explicit_value: Any = None) -> Any:
         """Calculate chain_value_before based on parent"""
         if explicit_value is not None:
@@ -117,22 +374,40 @@ class KMRChainSpace:
             'invly': '⊘', 'inverse': '⊘', 'inv': '⊘',
             'add': '+', 'sub': '-', 'mul': '*', 'div': '/'
         }
-        op = operation
-        if operation.lower() in self._operation_aliases:
-            op = self._operation_aliases[operation.lower()]
+        op = self._resolve_operation(operation)
+
+        if element_id is not None and element_id in self.public_heap:
+            raise ValueError(f"Element {element_id[:16]}... already exists")
+
+        # Calculate chain values
+        before_value = self._get_chain_value_before(parent_id, chain_value_before)
+        after_value = None
+
+        # Interning: reuse an identical existing step
+        intern_key = None
+        if self.interning:
+            intern_key = self._intern_key(parent_id, op, value, before_value)
+            if intern_key is not None:
+                self.intern_lookups += 1
+                existing = self._intern_table.get(intern_key)
+                if existing is not None:
+                    if element_id is None:
+                        self.intern_reused_elements += 1
+                        return existing
+                    self.intern_reused_values += 1
+                    after_value = self.private_heap[existing].chain_value_after
 
         # Generate IDs
         if element_id is None:
             element_id = self._generate_id()
-        elif element_id in self.public_heap:
-            raise ValueError(f"Element {element_id[:16]}... already exists")
 
         if parent_id is None:
             parent_id = self._generate_id()
 
-        # Calculate chain values
-        before_value = self._get_chain_value_before(parent_id, chain_value_before)
-        after_value = self._apply_operation(before_value, op, value)
+        if after_value is None and self.tunneling_shortcut and op == '⊘' and chain_value_before is None:
+            after_value = self._tunneling_shortcut_value(parent_id, value)
+        if after_value is None:
+            after_value = self._apply_operation(before_value, op, value)
 
         # Create and store elements
         public_elem = PublicChainElement(element_id, value, op)
@@ -140,9 +415,70 @@ class KMRChainSpace:
 
         self.public_heap[element_id] = public_elem
         self.private_heap[element_id] = private_elem
+        if intern_key is not None and intern_key not in self._intern_table:
+            self._intern_table[intern_key] = element_id
 
         return element_id
 
+    def add_evaluated_element(self,
+                              operation: str,
+                              value: Any,
+                              chain_value_before: Any,
+                              chain_value_after: Any,
+                              parent_id: str = None,
+                              element_id: str = None) -> str:
+        """
+        Add element whose chain values were computed outside the space
+        (bulk evaluators); the operation handler is not called
+
+        Returns:
+            Created element ID
+        """
+        op = self._resolve_operation(operation)
+
+        if element_id is None:
+            element_id = self._generate_id()
+        elif element_id in self.public_heap:
+            raise ValueError(f"Element {element_id[:16]}... already exists")
+
+        if parent_id is None:
+            parent_id = self._generate_id()
+
+        self.public_heap[element_id] = PublicChainElement(element_id, value, op)
+        self.private_heap[element_id] = PrivateChainElement(
+            element_id, parent_id, chain_value_before, chain_value_after)
+
+        return element_id
+
+    def add_evaluated_elements(self, records) -> list:
+        """
+        Bulk variant of add_evaluated_element
+
+        Args:
+            records: Iterable of (element_id, parent_id, operation, value,
+                chain_value_before, chain_value_after) tuples; operations
+                must already be resolved symbols and IDs must be new
+
+        Returns:
+            List of inserted element IDs
+        """
+        records = list(records)
+        public_heap = self.public_heap
+        private_heap = self.private_heap
+
+        # Validate the whole batch first so a duplicate never leaves it half inserted
+        ids = [record[0] for record in records]
+        seen = set()
+        for element_id in ids:
+            if element_id in public_heap or element_id in seen:
+                raise ValueError(f"Element {element_id[:16]}... already exists")
+            seen.add(element_id)
+
+        for element_id, parent_id, op, value, before_value, after_value in records:
+            public_heap[element_id] = PublicChainElement(element_id, value, op)
+            private_heap[element_id] = PrivateChainElement(element_id, parent_id, before_value, after_value)
+        return ids
+
     def check_consistency(self, element_id: str) -> bool:
         """Check if element is consistent with its parent"""
         if element_id not in self.private_heap:
@@ -179,6 +515,7 @@ class KMRChainSpace:
         """Clear chain space"""
         self.public_heap.clear()
         self.private_heap.clear()
+        self._intern_table.clear()
 
     def __str__(self) -> str:
         """String representation"""
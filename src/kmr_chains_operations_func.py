@@ -7,9 +7,144 @@ Author: Sergei Terikhov
 Description: Extends KMR chains to support functional values and compositions
 """
 
-from typing import Any, Callable, Dict
+from typing import Any, Callable, Dict, Optional
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import ast
+import hashlib
 import inspect
-import sympy as sp
+import numbers
+import pickle
+import sys
+import numpy as np
+
+
+def _sympy():
+    """
+    Import sympy on first use
+
+    sympy takes longer to import than the rest of the chain framework, so
+    it is only loaded when an expression needs symbolic parsing or a basic
+    function is applied to a symbolic argument.
+    """
+    import sympy
+    return sympy
+
+
+def _is_sympy(x: Any) -> bool:
+    """True for SymPy objects (which can only exist once sympy is imported)"""
+    sympy = sys.modules.get('sympy')
+    return sympy is not None and isinstance(x, sympy.Basic)
+
+
+def _elementwise(name: str, numpy_func: Callable) -> Callable:
+    """
+    Basic function that uses NumPy for numbers and arrays and SymPy otherwise
+
+    Real scalars give NumPy floats (log(-1) is nan, as for arrays); SymPy
+    numbers and expressions keep exact SymPy results.
+    """
+    def func(x):
+        if isinstance(x, (np.ndarray, np.generic)):
+            return numpy_func(x)
+        if isinstance(x, numbers.Real) and not _is_sympy(x):
+            return numpy_func(float(x))
+        return getattr(_sympy(), name)(x)
+    func.__name__ = name
+    return func
+
+
+# ========== SAFE EXPRESSION COMPILER ==========
+
+# Functions and constants an expression may use
+SAFE_FUNCTIONS = {
+    'sin': np.sin, 'cos': np.cos, 'tan': np.tan,
+    'asin': np.arcsin, 'acos': np.arccos, 'atan': np.arctan,
+    'sinh': np.sinh, 'cosh': np.cosh, 'tanh': np.tanh,
+    'exp': np.exp, 'log': np.log, 'ln': np.log, 'sqrt': np.sqrt, 'abs': np.abs,
+}
+SAFE_CONSTANTS = {'pi': np.pi, 'e': np.e, 'E': np.e}
+
+_SAFE_OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.Mod, ast.FloorDiv,
+                   ast.UAdd, ast.USub)
+
+
+class _SafeExpression(ast.NodeVisitor):
+    """Reject every node outside the arithmetic whitelist"""
+
+    def __init__(self, var_name: str):
+        self.var_name = var_name
+
+    def generic_visit(self, node):
+        if not isinstance(node, (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Call, ast.Name,
+                                 ast.Constant, ast.Load) + _SAFE_OPERATORS):
+            raise ValueError(f"Unsupported syntax in expression: {type(node).__name__}")
+        return super().generic_visit(node)
+
+    def visit_Constant(self, node):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise ValueError(f"Unsupported constant in expression: {node.value!r}")
+
+    def visit_Name(self, node):
+        if node.id != self.var_name and node.id not in SAFE_CONSTANTS and node.id not in SAFE_FUNCTIONS:
+            raise ValueError(f"Unknown name in expression: {node.id}")
+
+    def visit_Call(self, node):
+        if not isinstance(node.func, ast.Name) or node.func.id not in SAFE_FUNCTIONS \
+                or node.keywords or len(node.args) != 1:
+            raise ValueError("Only one-argument calls of whitelisted functions are allowed")
+        self.generic_visit(node)
+
+
+def compile_expression(expr: str, var_name: str = 'x') -> Callable:
+    """
+    Compile an arithmetic expression of one variable into a function
+
+    The expression is parsed once and checked against a whitelist of
+    nodes (numbers, the variable, + - * / ** % //, unary signs, calls of
+    SAFE_FUNCTIONS, SAFE_CONSTANTS); ^ is read as a power, as in sympify.
+    Numeric constants are read as floats, so powers of constants overflow
+    to inf (or raise OverflowError) at once instead of growing unbounded
+    Python integers (9**9**9**9). The checked expression becomes the body
+    of a lambda compiled once without builtins and with NumPy functions,
+    so the result is a plain Python function that accepts scalars and
+    arrays. Results are cached by expression text.
+
+    Args:
+        expr: Expression as string
+        var_name: Variable name
+
+    Returns:
+        Callable function of one argument
+
+    Raises:
+        ValueError: If the expression is not valid or uses anything
+            outside the whitelist
+    """
+    # Positional arguments only, so that f(expr) and f(expr, 'x') share a cache entry
+    return _compile_expression(expr, var_name)
+
+
+@lru_cache(maxsize=1024)
+def _compile_expression(expr: str, var_name: str) -> Callable:
+    try:
+        tree = ast.parse(expr.strip().replace('^', '**'), mode='eval')
+    except SyntaxError as e:
+        raise ValueError(f"Invalid expression {expr!r}: {e.msg}")
+    _SafeExpression(var_name).visit(tree)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Constant):
+            try:
+                node.value = float(node.value)
+            except OverflowError:
+                raise ValueError(f"Constant out of float range in expression: {node.value}")
+
+    args = ast.arguments(posonlyargs=[], args=[ast.arg(arg=var_name)], vararg=None, kwonlyargs=[],
+                         kw_defaults=[], kwarg=None, defaults=[])
+    lambda_tree = ast.fix_missing_locations(ast.Expression(ast.Lambda(args=args, body=tree.body)))
+    namespace = {'__builtins__': {}, **SAFE_FUNCTIONS, **SAFE_CONSTANTS}
+    return eval(compile(lambda_tree, '<kmr expression>', 'eval'), namespace)
 
 
 class FunctionRegistry:
@@ -22,12 +157,12 @@ class FunctionRegistry:
         'cube': lambda x: x ** 3,
         'reciprocal': lambda x: 1 / x,
         'sqrt': lambda x: x ** 0.5,
-        'exp': lambda x: sp.exp(x) if hasattr(sp, 'exp') else __import__('math').exp(x),
-        'ln': lambda x: sp.log(x) if hasattr(sp, 'log') else __import__('math').log(x),
-        'log': lambda x: sp.log(x) if hasattr(sp, 'log') else __import__('math').log(x),
-        'sin': lambda x: sp.sin(x) if hasattr(sp, 'sin') else __import__('math').sin(x),
-        'cos': lambda x: sp.cos(x) if hasattr(sp, 'cos') else __import__('math').cos(x),
-        'tan': lambda x: sp.tan(x) if hasattr(sp, 'tan') else __import__('math').tan(x),
+        'exp': _elementwise('exp', np.exp),
+        'ln': _elementwise('log', np.log),
+        'log': _elementwise('log', np.log),
+        'sin': _elementwise('sin', np.sin),
+        'cos': _elementwise('cos', np.cos),
+        'tan': _elementwise('tan', np.tan),
         'kmr_direct': lambda x, k: x / (1 + k * x),
         'kmr_inverse': lambda x, k: x / (1 - k * x),
     }
@@ -43,16 +178,24 @@ class FunctionRegistry:
 
         Returns:
             Callable function
+
+        Raises:
+            ValueError: If the expression can be parsed neither by the safe
+                compiler nor by sympy
         """
         try:
-            # Try using sympy for symbolic expressions
+            # Plain arithmetic: compiled once, no sympy needed
+            return compile_expression(expr, var_name)
+        except ValueError:
+            pass
+        sp = _sympy()
+        try:
+            # Fall back to sympy for symbolic expressions
             var = sp.symbols(var_name)
             sympy_expr = sp.sympify(expr)
             return sp.lambdify(var, sympy_expr, 'numpy')
-        except:
-            # Fallback to eval (use with caution!)
-            # Note: In production code, you should implement safer parsing
-            return lambda x: eval(expr, {'x': x, 'math': __import__('math')})
+        except (sp.SympifyError, TypeError, SyntaxError) as e:
+            raise ValueError(f"Cannot parse expression {expr!r}: {e}")
 
     @staticmethod
     def compose(f: Callable, g: Callable) -> Callable:
@@ -87,6 +230,84 @@ class FunctionRegistry:
             f(*args, *remaining_args, **{**kwargs, **remaining_kwargs})
 
 
+# ========== SERIALIZABLE FUNCTION VALUES ==========
+
+class FunctionNode:
+    """
+    Functional chain value as an op tree that builds its callable lazily
+
+    Nodes:
+        FunctionNode('const', value)             constant function
+        FunctionNode('basic', name)              FunctionRegistry.BASIC_FUNCTIONS entry
+        FunctionNode('expr', text, var_name)     string expression (create_function)
+        FunctionNode('callable', f)              user callable
+        FunctionNode(op, f, g)                   f op g for op in ⊙ ⊘ + - * / (f, g nodes)
+        FunctionNode('∘', f, g)                  f(g(x))
+        FunctionNode('partial', f, arg)          f with arg applied first
+
+    Only the tree is pickled, never the built closures, so a node can be
+    sent to worker processes or stored on disk as long as its 'callable'
+    leaves are picklable (top-level functions, not lambdas).
+    """
+
+    BINARY_OPERATIONS = ('⊙', '⊘', '+', '-', '*', '/')
+
+    def __init__(self, op: str, *args: Any):
+        self.op = op
+        self.args = args
+        self._func = None
+
+    def __reduce__(self):
+        return (FunctionNode, (self.op, *self.args))
+
+    def __repr__(self) -> str:
+        return f"FunctionNode({self.op!r}, {', '.join(map(repr, self.args))})"
+
+    def __call__(self, *args, **kwargs):
+        if self._func is None:
+            self._func = self._build()
+        return self._func(*args, **kwargs)
+
+    def _build(self) -> Callable:
+        op, args = self.op, self.args
+        if op == 'const':
+            constant = args[0]
+            return lambda x: constant
+        if op == 'basic':
+            return FunctionRegistry.BASIC_FUNCTIONS[args[0]]
+        if op == 'expr':
+            return FunctionRegistry.create_function(*args)
+        if op == 'callable':
+            return args[0]
+        if op == '∘':
+            return FunctionRegistry.compose(args[0], args[1])
+        if op == 'partial':
+            return FunctionRegistry.partial_apply(args[0], args[1])
+        if op not in self.BINARY_OPERATIONS:
+            raise ValueError(f"Unknown function node: {op}")
+
+        f, g = args
+        if op == '⊙':
+            # f(x) ⊙ g(x) = f(x) / (1 + f(x) * g(x))
+            def func(x):
+                value = f(x)
+                return value / (1 + value * g(x))
+        elif op == '⊘':
+            # f(x) ⊘ g(x) = f(x) / (1 - f(x) * g(x))
+            def func(x):
+                value = f(x)
+                return value / (1 - value * g(x))
+        elif op == '+':
+            func = lambda x: f(x) + g(x)
+        elif op == '-':
+            func = lambda x: f(x) - g(x)
+        elif op == '*':
+            func = lambda x: f(x) * g(x)
+        else:
+            func = lambda x: f(x) / g(x)
+        return func
+
+
 class FunctionalOperationHandlers:
     """Handlers for operations with functional values"""
 
@@ -111,62 +332,44 @@ class FunctionalOperationHandlers:
 
         return value
 
-    def _ensure_function(self, value: Any) -> Callable:
-        """Convert value to function if needed"""
+    def _ensure_function(self, value: Any) -> FunctionNode:
+        """Convert value to a function node if needed"""
         # First resolve possible ID
         resolved = self._resolve_value(value)
 
-        if callable(resolved):
+        if isinstance(resolved, FunctionNode):
             return resolved
+        elif callable(resolved):
+            return FunctionNode('callable', resolved)
         elif isinstance(resolved, str):
             # Check if it's a predefined function name
             if resolved in self.registry.BASIC_FUNCTIONS:
-                return self.registry.BASIC_FUNCTIONS[resolved]
+                return FunctionNode('basic', resolved)
             # Try to parse as expression
             try:
-                return self.registry.create_function(resolved)
+                node = FunctionNode('expr', resolved)
+                node._func = self.registry.create_function(resolved)
+                return node
             except:
                 # Return constant function
                 try:
-                    constant = float(resolved)
-                    return lambda x: constant
+                    return FunctionNode('const', float(resolved))
                 except:
-                    return lambda x: resolved
+                    return FunctionNode('const', resolved)
         else:
             # Return constant function
             try:
-                constant = float(resolved)
-                return lambda x: constant
+                return FunctionNode('const', float(resolved))
             except:
-                return lambda x: resolved
+                return FunctionNode('const', resolved)
 
-    def _apply_to_function(self, f: Callable, operation: str, param: Any) -> Callable:
+    def _apply_to_function(self, f: FunctionNode, operation: str, param: Any) -> FunctionNode:
         """Apply operation to a function"""
         param_func = self._ensure_function(param)
 
-        if operation == '⊙':
-            # f(x) ⊙ g(x) = f(x) / (1 + f(x) * g(x))
-            return lambda x: f(x) / (1 + f(x) * param_func(x))
-        elif operation == '⊘':
-            # f(x) ⊘ g(x) = f(x) / (1 - f(x) * g(x))
-            return lambda x: f(x) / (1 - f(x) * param_func(x))
-        elif operation == '+':
-            # f(x) + g(x)
-            return lambda x: f(x) + param_func(x)
-        elif operation == '-':
-            # f(x) - g(x)
-            return lambda x: f(x) - param_func(x)
-        elif operation == '*':
-            # f(x) * g(x)
-            return lambda x: f(x) * param_func(x)
-        elif operation == '/':
-            # f(x) / g(x)
-            return lambda x: f(x) / param_func(x)
-        elif operation == '∘':
-            # Function composition: f ∘ g
-            return self.registry.compose(f, param_func)
-        else:
-            raise ValueError(f"Unknown operation for functions: {operation}")
+        if operation in FunctionNode.BINARY_OPERATIONS or operation == '∘':
+            return FunctionNode(operation, f, param_func)
+        raise ValueError(f"Unknown operation for functions: {operation}")
 
     # Basic function creation
     def make_function(self, a: Any, b: Any) -> Callable:
@@ -218,12 +421,12 @@ class FunctionalOperationHandlers:
         """Function composition"""
         a_func = self._ensure_function(a)
         b_func = self._ensure_function(b)
-        return self.registry.compose(a_func, b_func)
+        return FunctionNode('∘', a_func, b_func)
 
     def partial_apply_func(self, a: Any, b: Any) -> Any:
         """Partial application of function"""
         a_func = self._ensure_function(a)
-        return self.registry.partial_apply(a_func, b)
+        return FunctionNode('partial', a_func, b)
 
 
 def create_functional_handlers(space_getter: Callable):
@@ -307,6 +510,229 @@ def evaluate_function_chain(element_id: str, space, *args, **kwargs) -> Any:
         return func
 
 
+def evaluate_function_chain_vectorized(element_id: str, space, x) -> Dict[str, Any]:
+    """
+    Evaluate a functional chain on a whole array of points in one pass
+
+    Basic functions switch to NumPy ufuncs for array input, so the nested
+    chain closures run once on the array instead of once per point.
+    Chains whose callables cannot take arrays are evaluated point by point.
+
+    Args:
+        element_id: ID of the chain element
+        space: KMRChainSpace instance
+        x: Points (array-like)
+
+    Returns:
+        Dictionary with keys:
+            'values': float array of results, shaped like x
+            'poles': indices of points where the result is ±inf or NaN
+                (a zero denominator in ⊙f/⊘f or /f, or a point outside
+                the domain of a basic function)
+            'vectorized': False if the point-by-point fallback was used
+    """
+    x = np.asarray(x, dtype=float)
+    func = space.get_chain_value(element_id)
+    vectorized = True
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        if callable(func):
+            try:
+                values = np.asarray(func(x), dtype=float)
+            except Exception:
+                vectorized = False
+                values = np.array([float(func(v)) for v in x.ravel()]).reshape(x.shape)
+        else:
+            values = np.asarray(func, dtype=float)
+    values = np.broadcast_to(values, x.shape).copy()
+
+    return {
+        'values': values,
+        'poles': np.flatnonzero(~np.isfinite(values)),
+        'vectorized': vectorized,
+    }
+
+
+def _evaluate_chunk(func: Callable, x: np.ndarray) -> np.ndarray:
+    """Worker entry point (top-level so it can be pickled)"""
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        try:
+            values = np.asarray(func(x), dtype=float)
+        except Exception:
+            values = np.array([float(func(v)) for v in x])
+    return np.broadcast_to(values, x.shape).copy()
+
+
+def evaluate_function_chain_parallel(element_id: str, space, x, processes: Optional[int] = None,
+                                     chunk_size: Optional[int] = None) -> np.ndarray:
+    """
+    Evaluate a functional chain on an array of points across worker processes
+
+    The chain value (a FunctionNode tree) is pickled to the workers, each
+    evaluates one chunk of points vectorized.
+
+    Args:
+        element_id: ID of the chain element
+        space: KMRChainSpace instance
+        x: Points (array-like)
+        processes: Number of worker processes (None: evaluate in this process)
+        chunk_size: Points per chunk (default: size / processes)
+
+    Returns:
+        Float array of results, shaped like x
+
+    Raises:
+        pickle.PicklingError or TypeError: If the chain holds unpicklable
+            callables such as lambdas
+    """
+    x = np.asarray(x, dtype=float)
+    func = space.get_chain_value(element_id)
+    if not callable(func):
+        return np.broadcast_to(np.asarray(func, dtype=float), x.shape).copy()
+
+    flat = x.ravel()
+    if not processes or processes <= 1 or flat.size < 2:
+        return _evaluate_chunk(func, flat).reshape(x.shape)
+
+    if chunk_size is None:
+        chunk_size = -(-flat.size // processes)
+    chunks = [flat[i:i + chunk_size] for i in range(0, flat.size, chunk_size)]
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        results = list(executor.map(_evaluate_chunk, [func] * len(chunks), chunks))
+    return np.concatenate(results).reshape(x.shape)
+
+
+def save_function(func: FunctionNode, path: str) -> None:
+    """Store a functional chain value on disk (pickled op tree)"""
+    with open(path, 'wb') as f:
+        pickle.dump(func, f)
+
+
+def load_function(path: str) -> FunctionNode:
+    """Load a functional chain value stored by save_function"""
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+# ========== EVALUATION CACHE ==========
+
+class FunctionEvaluationCache:
+    """
+    LRU cache of functional chain results keyed by (element_id, arguments)
+
+    Scalar arguments are keyed by type and value (floats by their hex
+    form, so 0.0 and -0.0 differ and NaN finds its own entry), arrays by
+    shape, dtype and a digest of their bytes. Every entry remembers the chain value it
+    was computed from; when the element's chain value is no longer the
+    same object (the element was replaced, e.g. after clear() and
+    re-insertion under the same ID), all entries of that element are
+    dropped on the next lookup.
+
+    Cached array results are returned read-only.
+    """
+
+    def __init__(self, space, maxsize: int = 1024):
+        """
+        Args:
+            space: KMRChainSpace instance
+            maxsize: Maximum number of cached results
+        """
+        self.space = space
+        self.maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()
+        self._sources: Dict[str, Any] = {}
+        self._keys_by_element: Dict[str, set] = {}
+        self.hits = 0
+        self.misses = 0
+        self.uncacheable = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _argument_key(arg: Any):
+        if isinstance(arg, np.ndarray):
+            data = np.ascontiguousarray(arg)
+            return ('array', data.shape, data.dtype.str, hashlib.sha256(memoryview(data)).digest())
+        if isinstance(arg, (float, np.floating)):
+            return (type(arg).__name__, float(arg).hex())
+        hash(arg)
+        return (type(arg).__name__, arg)
+
+    def _drop(self, key) -> None:
+        del self._entries[key]
+        keys = self._keys_by_element[key[0]]
+        keys.discard(key)
+        if not keys:
+            del self._keys_by_element[key[0]]
+            del self._sources[key[0]]
+
+    def invalidate(self, element_id: Optional[str] = None) -> None:
+        """Drop the cached results of one element (or of all elements)"""
+        if element_id is None:
+            self._entries.clear()
+            self._sources.clear()
+            self._keys_by_element.clear()
+            return
+        for key in list(self._keys_by_element.get(element_id, ())):
+            self._drop(key)
+
+    def evaluate(self, element_id: str, *args) -> Any:
+        """Cached counterpart of evaluate_function_chain"""
+        value = self.space.get_chain_value(element_id)
+        if element_id in self._sources and self._sources[element_id] is not value:
+            self.invalidations += 1
+            self.invalidate(element_id)
+
+        try:
+            key = (element_id,) + tuple(self._argument_key(arg) for arg in args)
+        except TypeError:
+            self.uncacheable += 1
+            return evaluate_function_chain(element_id, self.space, *args)
+
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+        self.misses += 1
+        result = evaluate_function_chain(element_id, self.space, *args)
+        if isinstance(result, np.ndarray):
+            result.flags.writeable = False
+        self._entries[key] = result
+        self._sources[element_id] = value
+        self._keys_by_element.setdefault(element_id, set()).add(key)
+        while len(self._entries) > self.maxsize:
+            self.evictions += 1
+            self._drop(next(iter(self._entries)))
+        return result
+
+    def stats(self) -> dict:
+        """
+        Cache statistics
+
+        Returns:
+            Dictionary with keys:
+                'hits', 'misses': lookups answered from / added to the cache
+                'hit_rate': hits / (hits + misses)
+                'uncacheable': calls with unhashable arguments (not cached)
+                'evictions': entries dropped by the LRU limit
+                'invalidations': elements whose entries were dropped
+                    because their chain value was replaced
+                'size', 'maxsize': current and maximum number of entries
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'uncacheable': self.uncacheable,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+        }
+
+
 def create_kmr_function(k_value, base_func=None):
     """
     Create a KMR-transformed function
@@ -328,17 +754,21 @@ def create_kmr_function(k_value, base_func=None):
     return kmr_func
 
 
-def create_chain_function(element_id: str, space):
+def create_chain_function(element_id: str, space, cache: Optional[FunctionEvaluationCache] = None):
     """
     Create a function from a chain
 
     Args:
         element_id: ID of the chain element
         space: KMRChainSpace instance
+        cache: Optional FunctionEvaluationCache for this space; results
+            are then memoized per argument
 
     Returns:
         Function representing the entire chain
     """
+    if cache is not None:
+        return lambda *args: cache.evaluate(element_id, *args)
 
     def chain_func(*args, **kwargs):
         value = space.get_chain_value(element_id)
@@ -347,4 +777,30 @@ def create_chain_function(element_id: str, space):
         else:
             return value
 
-    return chain_func
\ No newline at end of file
+    return chain_func
+
+
+if __name__ == "__main__":
+    import time
+    from kmr_chains import KMRChainSpace
+    from kmr_chains_operations_init import initialize_functional_operations
+
+    print("=== KMR Functional Chains: serializable values ===")
+    space = initialize_functional_operations(KMRChainSpace())
+    node_id = space.add_element('identity', 'identity')
+    for K in (2.0, 0.5, 1.5):
+        node_id = space.add_element('⊙f', K, parent_id=node_id)
+    node_id = space.add_element('+f', 'sin(x)^2', parent_id=node_id)
+    value = space.get_chain_value(node_id)
+    print(f"Chain value: {value}")
+    print(f"Pickled size: {len(pickle.dumps(value))} bytes")
+
+    grid = np.linspace(-1.0, 1.0, 2_000_000)
+    start = time.perf_counter()
+    serial = evaluate_function_chain_parallel(node_id, space, grid)
+    serial_time = time.perf_counter() - start
+    start = time.perf_counter()
+    parallel = evaluate_function_chain_parallel(node_id, space, grid, processes=4)
+    parallel_time = time.perf_counter() - start
+    print(f"{grid.size:,} points: one process {serial_time:.3f} s, four worker processes {parallel_time:.3f} s, "
+          f"identical: {np.array_equal(serial, parallel)}")
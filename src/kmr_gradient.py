@@ -0,0 +1,226 @@
+# kmr_gradient.py
+"""
+KMR Chain Gradients - Reverse-mode derivatives of chain values
+Version: 1.0.0
+License: GPL 3.0 (see LICENSE)
+Author: Sergei Terikhov
+
+For a chain y_0 = start, y_j = y_{j-1} (op_j K_j), the local derivatives
+of one step follow from Theorem 2 (Section 9.3):
+
+    y = x ⊙ K:   ∂y/∂x = 1/(1 + K·x)² = y²/x²,   ∂y/∂K = -y²
+    y = x ⊘ K:   ∂y/∂x = 1/(1 - K·x)² = y²/x²,   ∂y/∂K =  y²
+
+(the 1/d² form is also valid at x = 0). One forward pass stores the values
+before every step, one reverse pass accumulates the adjoint
+∂y_n/∂y_j, so all n + 1 partials cost O(n) instead of the n + 1 chain
+evaluations of finite differences. Steps +, -, *, / are differentiated
+too, so KMRChainSpace paths with mixed numeric operations are covered.
+Every pass is vectorized over a batch of chains.
+"""
+
+from typing import Any, Dict, Sequence
+
+import numpy as np
+
+from kmr_operations import kmr_dircly_batch, kmr_invly_batch
+from kmr_rewrite import chain_path
+
+GRADIENT_OPERATIONS = ('⊙', '⊘', '+', '-', '*', '/')
+
+
+def _step_forward(operation: str, x: np.ndarray, K: np.ndarray) -> np.ndarray:
+    if operation == '⊙':
+        return kmr_dircly_batch(x, K)
+    if operation == '⊘':
+        return kmr_invly_batch(x, K)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if operation == '+':
+            return x + K
+        if operation == '-':
+            return x - K
+        if operation == '*':
+            return x * K
+        if operation == '/':
+            return x / K
+    raise ValueError(f"Operation {operation} cannot be differentiated")
+
+
+def _step_partials(operation: str, x: np.ndarray, K: np.ndarray, y: np.ndarray):
+    """Local partials (∂y/∂x, ∂y/∂K) of one step"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if operation == '⊙':
+            return 1.0 / np.square(1.0 + K * x), -np.square(y)
+        if operation == '⊘':
+            return 1.0 / np.square(1.0 - K * x), np.square(y)
+        if operation == '+':
+            return np.ones_like(x), np.ones_like(x)
+        if operation == '-':
+            return np.ones_like(x), -np.ones_like(x)
+        if operation == '*':
+            return K, x
+        return 1.0 / K, -x / np.square(K)
+
+
+# ========== BATCH GRADIENTS ==========
+
+def chain_gradient_batch(starts, operations, values) -> Dict[str, Any]:
+    """
+    Values and all partial derivatives of many chains of equal length
+
+    Args:
+        starts: Start values, shape (m,)
+        operations: One of GRADIENT_OPERATIONS per step, shape (n,) for all
+            chains or (m, n) per chain
+        values: Step parameters, shape (m, n)
+
+    Returns:
+        Dictionary with keys:
+            'values': (m,) chain results y_n
+            'd_start': (m,) ∂y_n/∂start
+            'd_values': (m, n) ∂y_n/∂K_j
+            'before': (m, n) value before each step
+        Chains that pass through a pole have NaN results and gradients.
+    """
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    m, n = values.shape
+    starts = np.broadcast_to(np.asarray(starts, dtype=float), (m,))
+    ops = np.asarray(operations)
+    if ops.ndim == 1:
+        ops = np.broadcast_to(ops, (m, n))
+    unknown = set(np.unique(ops).tolist()) - set(GRADIENT_OPERATIONS) if ops.size else set()
+    if unknown:
+        raise ValueError(f"Operations {sorted(unknown)} cannot be differentiated")
+
+    # Forward pass: values before every step
+    states = np.empty((m, n + 1))
+    states[:, 0] = starts
+    for j in range(n):
+        x, K, column = states[:, j], values[:, j], ops[:, j]
+        y = np.empty(m)
+        for op in np.unique(column):
+            mask = column == op
+            y[mask] = _step_forward(op, x[mask], K[mask])
+        states[:, j + 1] = y
+
+    # Reverse pass: adjoint ∂y_n/∂y_j
+    d_values = np.empty((m, n))
+    adjoint = np.ones(m)
+    for j in range(n - 1, -1, -1):
+        x, K, y, column = states[:, j], values[:, j], states[:, j + 1], ops[:, j]
+        d_x = np.empty(m)
+        d_K = np.empty(m)
+        for op in np.unique(column):
+            mask = column == op
+            d_x[mask], d_K[mask] = _step_partials(op, x[mask], K[mask], y[mask])
+        d_values[:, j] = adjoint * d_K
+        adjoint = adjoint * d_x
+
+    failed = np.isnan(states[:, n])
+    adjoint[failed] = np.nan
+    d_values[failed] = np.nan
+    return {
+        'values': states[:, n],
+        'd_start': adjoint,
+        'd_values': d_values,
+        'before': states[:, :n],
+    }
+
+
+# ========== SINGLE CHAINS ==========
+
+def compute_chain_gradient(*elements: float) -> Dict[str, Any]:
+    """
+    Value and gradient of X = A1 ⊙ A2 ⊙ ... ⊙ An
+
+    Returns:
+        Dictionary with 'value' (X) and 'gradient' (array of ∂X/∂A_k,
+        k = 1..n)
+    """
+    if not elements:
+        return {'value': 0.0, 'gradient': np.empty(0)}
+    result = chain_gradient_batch([elements[0]], ['⊙'] * (len(elements) - 1), [list(elements[1:])])
+    return {
+        'value': float(result['values'][0]),
+        'gradient': np.concatenate((result['d_start'], result['d_values'][0])),
+    }
+
+
+def chain_gradient(start: float, operations: Sequence[str], values: Sequence[float]) -> Dict[str, Any]:
+    """
+    Value and gradient of start (op_1 K_1) ... (op_n K_n)
+
+    Returns:
+        Dictionary with 'value', 'd_start' and 'd_values' (array of ∂y_n/∂K_j)
+    """
+    result = chain_gradient_batch([start], list(operations), [list(values)])
+    return {
+        'value': float(result['values'][0]),
+        'd_start': float(result['d_start'][0]),
+        'd_values': result['d_values'][0],
+    }
+
+
+def chain_path_gradient(space, element_id: str) -> Dict[str, Any]:
+    """
+    Gradient of a KMRChainSpace chain value with respect to its path
+
+    The path from the chain root to element_id must consist of numeric
+    steps with operations in GRADIENT_OPERATIONS.
+
+    Returns:
+        Dictionary with 'element_ids' (path in chain order), 'value',
+        'd_start' (∂/∂ root chain_value_before) and 'd_values'
+        (∂/∂ value of each path element)
+    """
+    start, steps, ids = chain_path(space, element_id)
+    operations = [space._resolve_operation(op) for op, _ in steps]
+    try:
+        values = [float(value) for _, value in steps]
+        start = float(start)
+    except (TypeError, ValueError):
+        raise ValueError("Chain path contains non-numeric values")
+
+    result = chain_gradient(start, operations, values)
+    result['element_ids'] = ids
+    return result
+
+
+if __name__ == "__main__":
+    import time
+    from kmr_tunneling import compute_chain
+
+    print("=== KMR Chain Gradients ===")
+    elements = (2.0, 3.0, 0.5, 4.0)
+    result = compute_chain_gradient(*elements)
+    X = result['value']
+    print(f"X = 2 ⊙ 3 ⊙ 0.5 ⊙ 4 = {X!r}")
+    print(f"∂X/∂A_k = {result['gradient']}")
+    print(f"Closed form: ∂X/∂A1 = X²/A1² = {X ** 2 / 4.0!r}, ∂X/∂A_k = -X² = {-X ** 2!r}")
+
+    h = 1e-6
+    fd = [(compute_chain(*elements[:k], elements[k] + h, *elements[k + 1:]) -
+           compute_chain(*elements[:k], elements[k] - h, *elements[k + 1:])) / (2 * h)
+          for k in range(len(elements))]
+    print(f"Central differences: {np.array(fd)}")
+
+    mixed = chain_gradient(1.5, ['⊙', '*', '⊘', '+', '/'], [0.5, 3.0, 0.2, -1.0, 4.0])
+    print(f"\n1.5 ⊙ 0.5 * 3 ⊘ 0.2 + (-1) / 4 = {mixed['value']!r}")
+    print(f"∂/∂start = {mixed['d_start']!r}, ∂/∂K = {mixed['d_values']}")
+
+    rng = np.random.default_rng(0)
+    m, n = 1000, 1000
+    starts = rng.uniform(0.5, 2.0, m)
+    ops = rng.choice(['⊙', '⊘'], (m, n))
+    values = rng.uniform(0.0, 0.001, (m, n))
+
+    start = time.perf_counter()
+    batch = chain_gradient_batch(starts, ops, values)
+    elapsed = time.perf_counter() - start
+
+    # Reciprocal additivity: ∂y_n/∂K_j = ∓y_n² and ∂y_n/∂start = y_n²/start²
+    y = batch['values'][:, None]
+    expected = np.where(ops == '⊙', -1.0, 1.0) * y ** 2
+    err = np.max(np.abs(batch['d_values'] - expected) / np.abs(expected))
+    print(f"\n{m:,} mixed chains × {n:,} steps: all {m * (n + 1):,} partials in {elapsed:.3f} s, "
+          f"max rel error vs closed form {err:.2e} (finite differences: {m * (n + 1):,} chain runs)")
@@ -0,0 +1,323 @@
+# kmr_interval.py
+"""
+KMR Interval Arithmetic - Guaranteed error bounds for KMR operators and chains
+Version: 1.0.0
+License: GPL 3.0 (see LICENSE)
+Author: Sergei Terikhov
+
+Every value is an interval (lo, hi) that encloses the exact real result.
+Each floating-point step is rounded outward by one ulp, so the enclosure
+holds for the rounding error of the whole computation.
+
+The direct operator is evaluated in the reciprocal form
+A ⊙ K = 1/(1/A + K), where A and K occur once each and the enclosure
+stays tight. A pole (0 ∈ 1/A + K) yields an unbounded interval instead
+of NaN.
+"""
+
+import math
+from typing import Any, Tuple
+import numpy as np
+
+from kmr_operations import _kmr_base, _kmr_base_batch
+
+Interval = Tuple[float, float]
+
+_ENTIRE = (-math.inf, math.inf)
+
+
+# ========== INTERVAL BASICS ==========
+
+def _down(x: float) -> float:
+    return math.nextafter(x, -math.inf)
+
+
+def _up(x: float) -> float:
+    return math.nextafter(x, math.inf)
+
+
+def interval(lo: Any, hi: Any = None) -> Interval:
+    """Create an interval; a single float gives the point interval [x, x]"""
+    if isinstance(lo, tuple):
+        return lo
+    if hi is None:
+        hi = lo
+    lo, hi = float(lo), float(hi)
+    if lo > hi:
+        raise ValueError(f"Invalid interval: lo={lo} > hi={hi}")
+    return (lo, hi)
+
+
+def width(iv: Interval) -> float:
+    """Width hi - lo of the interval"""
+    return iv[1] - iv[0]
+
+
+def midpoint(iv: Interval) -> float:
+    """Midpoint of the interval"""
+    lo, hi = iv
+    if math.isinf(lo) or math.isinf(hi):
+        return float('nan')
+    return lo + (hi - lo) / 2
+
+
+def contains(iv: Interval, x: float) -> bool:
+    """Check whether x lies in the interval"""
+    return iv[0] <= x <= iv[1]
+
+
+def is_tight(iv: Interval, rel_tol: float = 1e-12, abs_tol: float = 1e-300) -> bool:
+    """
+    Check whether the enclosure is already tight enough
+
+    A tight enclosure means a high-precision re-check of the value
+    cannot change it beyond the tolerance and can be skipped.
+    """
+    lo, hi = iv
+    if math.isinf(lo) or math.isinf(hi):
+        return False
+    return (hi - lo) <= max(rel_tol * max(abs(lo), abs(hi)), abs_tol)
+
+
+def iv_add(a: Interval, b: Interval) -> Interval:
+    """[a] + [b] with outward rounding"""
+    return (_down(a[0] + b[0]), _up(a[1] + b[1]))
+
+
+def iv_neg(a: Interval) -> Interval:
+    """-[a] (exact)"""
+    return (-a[1], -a[0])
+
+
+def _mul0(x: float, y: float) -> float:
+    # 0 · ∞ is taken as 0 for interval endpoints
+    if x == 0 or y == 0:
+        return 0.0
+    return x * y
+
+
+def iv_mul(a: Interval, b: Interval) -> Interval:
+    """[a] · [b] with outward rounding"""
+    products = (_mul0(a[0], b[0]), _mul0(a[0], b[1]),
+                _mul0(a[1], b[0]), _mul0(a[1], b[1]))
+    return (_down(min(products)), _up(max(products)))
+
+
+def iv_recip(a: Interval) -> Interval:
+    """1/[a] with outward rounding; unbounded if 0 ∈ [a]"""
+    lo, hi = a
+    if lo > 0 or hi < 0:
+        return (_down(1.0 / hi), _up(1.0 / lo))
+    if lo == 0 and hi > 0:
+        return (_down(1.0 / hi), math.inf)
+    if hi == 0 and lo < 0:
+        return (-math.inf, _up(1.0 / lo))
+    return _ENTIRE
+
+
+# ========== INTERVAL KMR OPERATORS ==========
+
+def interval_dircly(A: Any, K: Any) -> Interval:
+    """
+    Enclosure of A ⊙ K = A/(1 + K·A)
+
+    Args:
+        A: Interval or float
+        K: Interval or float
+
+    Returns:
+        Interval containing A ⊙ K for all A, K in the inputs
+    """
+    A = interval(A)
+    K = interval(K)
+
+    if A == (0.0, 0.0):
+        return (0.0, 0.0)
+
+    if A[0] > 0 or A[1] < 0:
+        # Reciprocal form: A ⊙ K = 1/(1/A + K)
+        return iv_recip(iv_add(iv_recip(A), K))
+
+    # A straddles zero: A · 1/(1 + K·A)
+    denom = iv_add((1.0, 1.0), iv_mul(K, A))
+    return iv_mul(A, iv_recip(denom))
+
+
+def interval_invly(A: Any, K: Any) -> Interval:
+    """Enclosure of A ⊘ K = A/(1 - K·A) = A ⊙ (-K)"""
+    return interval_dircly(A, iv_neg(interval(K)))
+
+
+def interval_add(A: float, K: Any, C: Any, eps: float = 1e-12) -> Interval:
+    """Enclosure of kmr_add: K + C = ((A ⊙ K) ⊙ C) ⊘ A⁻¹)⁻¹"""
+    A = _kmr_base(A, eps)
+    X = interval_dircly(A, K)
+    Y = interval_dircly(X, C)
+    Z = interval_invly(Y, iv_recip(interval(A)))
+    return iv_recip(Z)
+
+
+def interval_sub(A: float, K: Any, C: Any, eps: float = 1e-12) -> Interval:
+    """Enclosure of kmr_sub: K - C = -((A ⊘ K) ⊙ C) ⊘ A⁻¹)⁻¹"""
+    A = _kmr_base(A, eps)
+    X = interval_invly(A, K)
+    Y = interval_dircly(X, C)
+    Z = interval_invly(Y, iv_recip(interval(A)))
+    return iv_neg(iv_recip(Z))
+
+
+def compute_chain_interval(*elements: Any) -> Interval:
+    """
+    Enclosure of A1 ⊙ A2 ⊙ ... ⊙ An
+
+    Args:
+        *elements: Floats or intervals
+
+    Returns:
+        Interval containing the exact chain result
+    """
+    if not elements:
+        return (0.0, 0.0)
+
+    result = interval(elements[0])
+    for element in elements[1:]:
+        result = interval_dircly(result, element)
+    return result
+
+
+# ========== BATCHED NUMPY ENCLOSURES ==========
+
+def _batch_down(x: np.ndarray) -> np.ndarray:
+    return np.nextafter(x, -np.inf)
+
+
+def _batch_up(x: np.ndarray) -> np.ndarray:
+    return np.nextafter(x, np.inf)
+
+
+def _batch_recip(lo: np.ndarray, hi: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    with np.errstate(divide='ignore'):
+        r_lo = _batch_down(1.0 / hi)
+        r_hi = _batch_up(1.0 / lo)
+    positive = lo > 0
+    negative = hi < 0
+    touches_lo = (lo == 0) & (hi > 0)
+    touches_hi = (hi == 0) & (lo < 0)
+    out_lo = np.where(positive | negative | touches_lo, r_lo, -np.inf)
+    out_hi = np.where(positive | negative | touches_hi, r_hi, np.inf)
+    return out_lo, out_hi
+
+
+def _batch_mul(a_lo, a_hi, b_lo, b_hi) -> Tuple[np.ndarray, np.ndarray]:
+    with np.errstate(invalid='ignore'):
+        products = np.stack([a_lo * b_lo, a_lo * b_hi, a_hi * b_lo, a_hi * b_hi])
+    # 0 · ∞ is taken as 0 for interval endpoints
+    products = np.where(np.isnan(products), 0.0, products)
+    return _batch_down(products.min(axis=0)), _batch_up(products.max(axis=0))
+
+
+def dircly_interval_batch(a_lo, a_hi, k_lo, k_hi) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Batched enclosure of A ⊙ K over lower/upper bound arrays
+
+    Args:
+        a_lo, a_hi: Lower/upper bounds of A (array-like, broadcastable)
+        k_lo, k_hi: Lower/upper bounds of K
+
+    Returns:
+        (lo, hi) arrays enclosing A ⊙ K element-wise
+    """
+    a_lo, a_hi, k_lo, k_hi = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (a_lo, a_hi, k_lo, k_hi)))
+
+    # Reciprocal form for A not containing zero
+    r_lo, r_hi = _batch_recip(a_lo, a_hi)
+    s_lo, s_hi = _batch_down(r_lo + k_lo), _batch_up(r_hi + k_hi)
+    lo, hi = _batch_recip(s_lo, s_hi)
+
+    # A straddles zero: A · 1/(1 + K·A)
+    straddle = (a_lo <= 0) & (a_hi >= 0)
+    if np.any(straddle):
+        m_lo, m_hi = _batch_mul(k_lo, k_hi, a_lo, a_hi)
+        d_lo, d_hi = _batch_recip(_batch_down(1.0 + m_lo), _batch_up(1.0 + m_hi))
+        g_lo, g_hi = _batch_mul(a_lo, a_hi, d_lo, d_hi)
+        lo = np.where(straddle, g_lo, lo)
+        hi = np.where(straddle, g_hi, hi)
+
+    zero = (a_lo == 0) & (a_hi == 0)
+    lo = np.where(zero, 0.0, lo)
+    hi = np.where(zero, 0.0, hi)
+    return lo, hi
+
+
+def invly_interval_batch(a_lo, a_hi, k_lo, k_hi) -> Tuple[np.ndarray, np.ndarray]:
+    """Batched enclosure of A ⊘ K = A ⊙ (-K)"""
+    return dircly_interval_batch(a_lo, a_hi, -np.asarray(k_hi, dtype=float),
+                                 -np.asarray(k_lo, dtype=float))
+
+
+def add_interval_batch(A, K, C, eps: float = 1e-12) -> Tuple[np.ndarray, np.ndarray]:
+    """Batched enclosure of kmr_add(A, K, C) for point inputs A, K, C"""
+    A = _kmr_base_batch(A, eps)
+    K = np.asarray(K, dtype=float)
+    C = np.asarray(C, dtype=float)
+
+    x_lo, x_hi = dircly_interval_batch(A, A, K, K)
+    y_lo, y_hi = dircly_interval_batch(x_lo, x_hi, C, C)
+    ra_lo, ra_hi = _batch_recip(A, A)
+    z_lo, z_hi = invly_interval_batch(y_lo, y_hi, ra_lo, ra_hi)
+    return _batch_recip(z_lo, z_hi)
+
+
+def sub_interval_batch(A, K, C, eps: float = 1e-12) -> Tuple[np.ndarray, np.ndarray]:
+    """Batched enclosure of kmr_sub(A, K, C) for point inputs A, K, C"""
+    A = _kmr_base_batch(A, eps)
+    K = np.asarray(K, dtype=float)
+    C = np.asarray(C, dtype=float)
+
+    x_lo, x_hi = invly_interval_batch(A, A, K, K)
+    y_lo, y_hi = dircly_interval_batch(x_lo, x_hi, C, C)
+    ra_lo, ra_hi = _batch_recip(A, A)
+    z_lo, z_hi = invly_interval_batch(y_lo, y_hi, ra_lo, ra_hi)
+    r_lo, r_hi = _batch_recip(z_lo, z_hi)
+    return -r_hi, -r_lo
+
+
+def compute_chain_interval_batch(elements) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Batched enclosure of many chains of equal length
+
+    Args:
+        elements: Array of shape (batch, n); row i is the chain A1..An
+
+    Returns:
+        (lo, hi) arrays of shape (batch,)
+    """
+    elements = np.atleast_2d(np.asarray(elements, dtype=float))
+    lo = elements[:, 0].copy()
+    hi = elements[:, 0].copy()
+    for j in range(1, elements.shape[1]):
+        lo, hi = dircly_interval_batch(lo, hi, elements[:, j], elements[:, j])
+    return lo, hi
+
+
+def tight_mask(lo: np.ndarray, hi: np.ndarray, rel_tol: float = 1e-12,
+               abs_tol: float = 1e-300) -> np.ndarray:
+    """Batched is_tight: True where no high-precision re-check is needed"""
+    lo = np.asarray(lo, dtype=float)
+    hi = np.asarray(hi, dtype=float)
+    scale = np.maximum(np.abs(lo), np.abs(hi))
+    with np.errstate(invalid='ignore'):
+        return np.isfinite(lo) & np.isfinite(hi) & \
+            ((hi - lo) <= np.maximum(rel_tol * scale, abs_tol))
+
+
+if __name__ == "__main__":
+    print("=== KMR Interval Arithmetic ===")
+    print(f"2 ⊙ 3 ∈ {interval_dircly(2.0, 3.0)}")
+    print(f"2 ⊘ 3 ∈ {interval_invly(2.0, 3.0)}")
+    print(f"1 ⊘ 1 ∈ {interval_invly(1.0, 1.0)}  (pole)")
+    for A in (1.0, 0.1, 1e-6, 1e-12):
+        iv = interval_add(A, 3.0, 2.0)
+        print(f"kmr_add(A={A:g}, 3, 2) ∈ [{iv[0]!r}, {iv[1]!r}]  tight={is_tight(iv)}")
+    print(f"2 ⊙ 3 ⊙ 4 ⊙ 5 ∈ {compute_chain_interval(2, 3, 4, 5)}")
@@ -17,9 +17,15 @@ K + C = ( ( ( A ⊙ K ) ⊙ C ) ⊘ 1 A ) − 1
 K − C = − ( ( ( A ⊘ K ) ⊙ C ) ⊘ 1 A ) − 1 
 symmetric form:
 K − C = ( ( ( − A ⊘ K ) ⊙ C ) ⊘ 1 A ) − 1 
+
+Defines multiplication and division by KMR operators (Section 14):
+K · C = ( ( A ⊙ (K·C) ) ⊘ A⁻¹ )⁻¹, A ⊙ (K·C) = A ⊙ K ⊙ ... ⊙ K (C times)
+1 / C = A ⊙ C ⊘ A⁻¹
+K / C = C⁻¹ · K
 """
 
 import math
+import numpy as np
 
 def kmr_direct(A, K):
     """version without error protection of A ⊙ K = A/(1 + AK)"""
@@ -85,6 +91,44 @@ def kmr_invly(A: float, K: float) -> float:
     return kmr_inverse_sh(A, K)
 
 
+def kmr_dircly_batch(A, K) -> np.ndarray:
+    """Vectorized A ⊙ K over arrays with the same singularity handling as kmr_direct_sh.
+
+    Args:
+        A: Input values (array-like).
+        K: Parameters (array-like, broadcastable with A).
+
+    Returns:
+        Array of A ⊙ K; NaN where |1 + K*A| < 1e-15, 0 where A = 0.
+    """
+    A = np.asarray(A, dtype=float)
+    K = np.asarray(K, dtype=float)
+    denom = 1.0 + K * A
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = A / denom
+    result = np.where(np.abs(denom) < 1e-15, np.nan, result)
+    return np.where(A == 0, 0.0, result)
+
+
+def kmr_invly_batch(A, K) -> np.ndarray:
+    """Vectorized A ⊘ K over arrays with the same singularity handling as kmr_inverse_sh.
+
+    Args:
+        A: Input values (array-like).
+        K: Parameters (array-like, broadcastable with A).
+
+    Returns:
+        Array of A ⊘ K; NaN where |1 - K*A| < 1e-15, 0 where A = 0.
+    """
+    A = np.asarray(A, dtype=float)
+    K = np.asarray(K, dtype=float)
+    denom = 1.0 - K * A
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = A / denom
+    result = np.where(np.abs(denom) < 1e-15, np.nan, result)
+    return np.where(A == 0, 0.0, result)
+
+
 def kmr_add(A: float, K: float, C: float, eps: float = 1e-12) -> float:
     """Compute K + C using KMR operators without classical fallback.
 
@@ -126,3 +170,137 @@ def kmr_sub(A: float, K: float, C: float, eps: float = 1e-12) -> float:
     # Z = kmr_invly(Y, 1/A)
     # return 1/Z
 
+
+
+def _kmr_base(A: float, eps: float) -> float:
+    """Adjust |A| < eps to ±eps (see kmr_add)"""
+    if abs(A) < eps:
+        return math.copysign(eps, A) if A != 0 else eps
+    return A
+
+
+def _kmr_base_batch(A, eps: float) -> np.ndarray:
+    """Vectorized _kmr_base"""
+    A = np.asarray(A, dtype=float)
+    adjusted = np.where(A == 0, eps, np.copysign(eps, A))
+    return np.where(np.abs(A) < eps, adjusted, A)
+
+
+def kmr_dircly_repeat(A: float, K: float, C: int) -> float:
+    """Compute A ⊙ K ⊙ K ⊙ ... ⊙ K (C times) = A ⊙ (K·C) in O(log C) steps.
+
+    Uses the decomposition A ⊙ (K·2m) = (A ⊙ K·m) ⊙ K·m, where K·m is
+    extracted from the current state as ((A ⊙ K·m) ⊘ A⁻¹)⁻¹.
+
+    Args:
+        A: Base value (A ≠ 0).
+        K: Repeated parameter.
+        C: Number of repetitions (C ≥ 0).
+
+    Returns:
+        Result of the C-fold chain, NaN if a step lands on a pole.
+    """
+    if C == 0 or K == 0:
+        return A
+    X = kmr_dircly(A, K)
+    for bit in bin(C)[3:]:
+        X = kmr_dircly(X, 1 / kmr_invly(X, 1 / A))
+        if bit == '1':
+            X = kmr_dircly(X, K)
+    return X
+
+
+def kmr_dircly_repeat_batch(A, K, C) -> np.ndarray:
+    """Vectorized kmr_dircly_repeat over broadcast arrays (C integer ≥ 0).
+
+    Returns:
+        Array of A ⊙ (K·C); NaN where a step lands on a pole.
+    """
+    A, K, C = np.broadcast_arrays(np.asarray(A, dtype=float),
+                                  np.asarray(K, dtype=float),
+                                  np.asarray(C, dtype=np.int64))
+    idle = (C == 0) | (K == 0)
+    X = np.where(idle, A, kmr_dircly_batch(A, K))
+
+    bit_length = int(C.max()).bit_length() if C.size else 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for i in range(bit_length - 2, -1, -1):
+            active = ~idle & ((C >> (i + 1)) > 0)
+            X = np.where(active, kmr_dircly_batch(X, 1 / kmr_invly_batch(X, 1 / A)), X)
+            odd = active & (((C >> i) & 1) == 1)
+            X = np.where(odd, kmr_dircly_batch(X, K), X)
+    return X
+
+
+def kmr_mul(A: float, K: float, C: float, eps: float = 1e-12) -> float:
+    """Compute K · C using KMR operators (Section 14.3.4).
+
+    C = D + F with integer D and F in [0, 1):
+    A ⊙ (K·C) = (A ⊙ K ⊙ ... ⊙ K) ⊙ (K·F) with D repetitions of ⊙ K
+    (evaluated by doubling), then K·C = ((A ⊙ (K·C)) ⊘ A⁻¹)⁻¹.
+    A non-finite C has no integer part and gives NaN.
+    """
+    A = _kmr_base(A, eps)
+    if not math.isfinite(C):
+        return float('nan')
+    if K == 0 or C == 0:
+        return 0.0
+    if C < 0:
+        K, C = -K, -C
+
+    D = int(math.floor(C))
+    F = C - D
+    X = kmr_dircly_repeat(A, K, D)
+    if F:
+        X = kmr_dircly(X, K * F)
+    Z = kmr_invly(X, 1 / A)
+    return 1 / Z
+
+
+def kmr_reciprocal(A: float, C: float, eps: float = 1e-12) -> float:
+    """Compute 1/C using KMR operators: 1/C = A ⊙ C ⊘ A⁻¹."""
+    A = _kmr_base(A, eps)
+    X = kmr_dircly(A, C)
+    return kmr_invly(X, 1 / A)
+
+
+def kmr_div(A: float, K: float, C: float, eps: float = 1e-12) -> float:
+    """Compute K / C using KMR operators (Section 14.4.4).
+
+    K/C = C⁻¹ · K with C⁻¹ = A ⊙ C ⊘ A⁻¹; the integer part of K is
+    applied by doubling.
+    """
+    return kmr_mul(A, kmr_reciprocal(A, C, eps), K, eps)
+
+
+def kmr_mul_batch(A, K, C, eps: float = 1e-12) -> np.ndarray:
+    """Vectorized kmr_mul over broadcast arrays.
+
+    Returns:
+        Array of K · C; NaN where a step lands on a pole or C is not finite.
+    """
+    A, K, C = np.broadcast_arrays(_kmr_base_batch(A, eps),
+                                  np.asarray(K, dtype=float),
+                                  np.asarray(C, dtype=float))
+    finite = np.isfinite(C)
+    K = np.where(C < 0, -K, K)
+    C = np.where(finite, np.abs(C), 0.0)
+
+    D = np.floor(C)
+    F = C - D
+    X = kmr_dircly_repeat_batch(A, K, D.astype(np.int64))
+    X = np.where(F > 0, kmr_dircly_batch(X, K * F), X)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = 1 / kmr_invly_batch(X, 1 / A)
+    return np.where(finite, np.where((K == 0) | (C == 0), 0.0, result), np.nan)
+
+
+def kmr_reciprocal_batch(A, C, eps: float = 1e-12) -> np.ndarray:
+    """Vectorized kmr_reciprocal: 1/C = A ⊙ C ⊘ A⁻¹."""
+    A = _kmr_base_batch(A, eps)
+    return kmr_invly_batch(kmr_dircly_batch(A, C), 1 / A)
+
+
+def kmr_div_batch(A, K, C, eps: float = 1e-12) -> np.ndarray:
+    """Vectorized kmr_div over broadcast arrays."""
+    return kmr_mul_batch(A, kmr_reciprocal_batch(A, C, eps), K, eps)
@@ -0,0 +1,234 @@
+# kmr_projective.py
+"""
+KMR Projective Evaluation - Pole-safe chain evaluation with (num, den) pairs
+Version: 1.0.0
+License: GPL 3.0 (see LICENSE)
+Author: Sergei Terikhov
+
+A value x is carried as a projective pair (n, d) with x = n/d.
+Both KMR operators are Möbius maps and act on pairs without division:
+
+    (n, d) ⊙ K = (n, d + K·n)
+    (n, d) ⊘ K = (n, d - K·n)
+
+A pole (1 + K·A = 0) becomes the finite state (n, 0) = ∞, and the
+chain continues through it: ∞ ⊙ K = 1/K. Division happens only once,
+when the final pair is converted back to a float.
+"""
+
+import math
+from typing import Any, List, Tuple
+
+# Pair components are rescaled once they leave this range
+_RESCALE_LIMIT = 1e150
+_RESCALE_FLOOR = 1e-150
+
+ProjectivePair = Tuple[float, float]
+
+
+# ========== PAIR CONVERSION ==========
+
+def to_projective(value: Any) -> ProjectivePair:
+    """Convert a float (or an existing pair) to a projective pair"""
+    if isinstance(value, tuple):
+        return value
+    if math.isinf(value):
+        return (1.0, 0.0)
+    return (float(value), 1.0)
+
+
+def from_projective(pair: ProjectivePair) -> float:
+    """
+    Convert a projective pair back to a float
+
+    Returns:
+        n/d, float('inf') for the point at infinity (d = 0),
+        float('nan') for the degenerate pair (0, 0)
+    """
+    n, d = pair
+    if d == 0:
+        return float('nan') if n == 0 else float('inf')
+    return n / d
+
+
+def proj_normalize(pair: ProjectivePair) -> ProjectivePair:
+    """Rescale a pair so that max(|n|, |d|) = 1 (the value is unchanged)"""
+    n, d = pair
+    scale = max(abs(n), abs(d))
+    if scale == 0 or math.isinf(scale) or math.isnan(scale):
+        return pair
+    return (n / scale, d / scale)
+
+
+def _rescale_if_needed(n: float, d: float) -> ProjectivePair:
+    """Rescale only when a component leaves the safe exponent range"""
+    scale = max(abs(n), abs(d))
+    if scale > _RESCALE_LIMIT or (0 < scale < _RESCALE_FLOOR):
+        return (n / scale, d / scale)
+    return (n, d)
+
+
+# ========== PROJECTIVE OPERATORS ==========
+
+def proj_dircly(pair: Any, K: float) -> ProjectivePair:
+    """A ⊙ K on a projective pair: (n, d) -> (n, d + K·n)"""
+    n, d = to_projective(pair)
+    return _rescale_if_needed(n, d + K * n)
+
+
+def proj_invly(pair: Any, K: float) -> ProjectivePair:
+    """A ⊘ K on a projective pair: (n, d) -> (n, d - K·n)"""
+    n, d = to_projective(pair)
+    return _rescale_if_needed(n, d - K * n)
+
+
+# ========== CHAIN EVALUATION ==========
+
+def compute_chain_projective(*elements: float) -> ProjectivePair:
+    """
+    Compute A1 ⊙ A2 ⊙ ... ⊙ An as a projective pair
+
+    Intermediate poles do not interrupt the chain.
+
+    Returns:
+        Projective pair (n, d) of the chain result
+    """
+    if not elements:
+        return (0.0, 1.0)
+
+    n, d = to_projective(elements[0])
+    for element in elements[1:]:
+        n, d = _rescale_if_needed(n, d + element * n)
+    return (n, d)
+
+
+def compute_chain_safe(*elements: float) -> float:
+    """
+    Compute A1 ⊙ A2 ⊙ ... ⊙ An without aborting at intermediate poles
+
+    Returns:
+        Result of the chain, float('inf') if the final step lands on a pole
+    """
+    if not elements:
+        return 0.0
+    return from_projective(compute_chain_projective(*elements))
+
+
+def apply_operations_projective(start: Any, operations: List[Tuple[str, float]]) -> ProjectivePair:
+    """
+    Apply a mixed sequence of ⊙/⊘ steps to a starting value
+
+    Args:
+        start: Starting value (float or projective pair)
+        operations: List of (operation, value) with operation '⊙' or '⊘'
+
+    Returns:
+        Projective pair of the result
+    """
+    n, d = to_projective(start)
+    for op, K in operations:
+        if op == '⊙':
+            n, d = _rescale_if_needed(n, d + K * n)
+        elif op == '⊘':
+            n, d = _rescale_if_needed(n, d - K * n)
+        else:
+            raise ValueError(f"Unsupported operation for projective evaluation: {op}")
+    return (n, d)
+
+
+# ========== ELEMENT EXTRACTION ==========
+
+def extract_first_element_projective(X: float, *chain_elements: float) -> float:
+    """
+    Extract A1 = X ⊘ An ⊘ ... ⊘ A2 without failing at intermediate poles
+
+    Returns:
+        The first element A1 (float('inf') if it is the point at infinity)
+    """
+    pair = to_projective(X)
+    for element in reversed(chain_elements):
+        pair = proj_invly(pair, element)
+    return from_projective(pair)
+
+
+def extract_last_element_projective(X: float, *chain_elements: float) -> float:
+    """
+    Extract An = X⁻¹ - Z⁻¹, Z = A1 ⊙ ... ⊙ A_{n-1}, tolerating poles in Z
+
+    Raises:
+        ValueError: If X or Z is zero (An is undefined)
+    """
+    if not chain_elements:
+        return X
+
+    n, d = compute_chain_projective(*chain_elements)
+    if X == 0:
+        raise ValueError(f"Cannot compute 1/X: X={X}")
+    if n == 0:
+        raise ValueError("Cannot compute 1/Z: Z=0")
+    # Z⁻¹ = d/n (Z = ∞ gives Z⁻¹ = 0)
+    return 1.0 / X - d / n
+
+
+def extract_intermediate_element_projective(X: float, left_chain: List[float],
+                                            right_chain: List[float]) -> float:
+    """
+    Extract A_k = 1/(X ⊘ A_n ⊘ ... ⊘ A_{k+1}) - 1/L, L = A1 ⊙ ... ⊙ A_{k-1}
+
+    Both the left part and the right unwinding are carried as pairs,
+    so poles along either side are passed through.
+
+    Raises:
+        ValueError: If D or L is zero (A_k is undefined)
+    """
+    ln, ld = compute_chain_projective(*left_chain) if left_chain else (0.0, 1.0)
+
+    pair = to_projective(X)
+    for element in reversed(right_chain):
+        pair = proj_invly(pair, element)
+    dn, dd = pair
+
+    if dn == 0:
+        raise ValueError("Cannot compute 1/D: D=0")
+    if ln == 0:
+        raise ValueError("Cannot compute 1/L: L=0")
+
+    return dd / dn - ld / ln
+
+
+# ========== CHAIN SPACE INTEGRATION ==========
+
+def create_projective_handlers():
+    """Create ⊙p/⊘p handlers whose chain values are projective pairs"""
+    return {
+        '⊙p': proj_dircly,
+        '⊘p': proj_invly,
+    }
+
+
+PROJECTIVE_OPERATION_ALIASES = {
+    'dircly_p': '⊙p',
+    'direct_p': '⊙p',
+    'invly_p': '⊘p',
+    'inverse_p': '⊘p',
+}
+
+
+def initialize_projective_operations(space):
+    """Register projective operations in a KMRChainSpace"""
+    for op_symbol, handler in create_projective_handlers().items():
+        space.register_operation(op_symbol, handler, op_map=PROJECTIVE_OPERATION_ALIASES)
+    return space
+
+
+if __name__ == "__main__":
+    print("=== KMR Projective Evaluation ===")
+
+    # 1 ⊙ -1 is a pole; the chain continues: ∞ ⊙ 2 = 1/2
+    print(f"1 ⊙ -1 ⊙ 2 (projective) = {compute_chain_safe(1.0, -1.0, 2.0)}")
+    print(f"pair = {compute_chain_projective(1.0, -1.0, 2.0)}")
+
+    # Extraction through a pole in the left part
+    X = compute_chain_safe(1.0, -1.0, 2.0, 4.0)
+    print(f"X = 1 ⊙ -1 ⊙ 2 ⊙ 4 = {X}")
+    print(f"A4 = {extract_last_element_projective(X, 1.0, -1.0, 2.0)}")
@@ -0,0 +1,353 @@
+# kmr_rewrite.py
+"""
+KMR Chain Rewriting - Algebraic simplification of chains before evaluation
+Version: 1.0.0
+License: GPL 3.0 (see LICENSE)
+Author: Sergei Terikhov
+
+Rewrite laws applied (see kmr_formulas_reference.md):
+
+    A ⊘ K = A ⊙ (-K)                    duality (9.2)
+    (A ⊙ K) ⊙ C = A ⊙ (K + C)           group property (9.2)
+    A ⊙ 0 = A                           identity, covers (A ⊘ K) ⊙ K = A (5.1, 5.2)
+    A + 0 = A - 0 = A · 1 = A / 1 = A   arithmetic identities
+    Y ⊙ X ⊘ Y⁻¹ = X⁻¹                   tunneling (11.1)
+
+Every maximal run of ⊙/⊘ steps is fused into one ⊙ step whose parameter
+is the correctly rounded sum (math.fsum) of the run. Other operations
+are barriers. Fused runs are the analytic continuation through any
+intermediate pole of the literal chain.
+
+A tunnel needs the value Y before its ⊙ X step. Y is known at the start
+of a chain and, on a KMRChainSpace path, from the stored
+chain_value_before of every element, so tunnels are collapsed anywhere
+in a path. With a space, each rule only applies to operations whose
+handler is still the default one.
+"""
+
+import math
+import numbers
+import operator
+from itertools import compress
+from typing import Any, Dict, List, Tuple
+
+from kmr_operations import kmr_dircly, kmr_invly
+
+Step = Tuple[str, Any]
+
+_KMR_SIGNS = {'⊙': 1, '⊘': -1}
+
+# Parameter that makes an arithmetic step the identity
+_IDENTITY_PARAMETERS = {'+': 0, '-': 0, '*': 1, '/': 1}
+
+# Default KMRChainSpace handlers; the rewrite laws hold for these only
+_DEFAULT_HANDLERS = {
+    '⊙': kmr_dircly,
+    '⊘': kmr_invly,
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+}
+
+# Parameter types fused without a per-step isinstance check, and their
+# float signs (int * float is slower and would round Fractions)
+_FAST_TYPES = frozenset((float, int))
+_FAST_SIGNS = {'⊙': 1.0, '⊘': -1.0}
+
+
+def _new_stats(original_ops: int) -> Dict[str, int]:
+    return {
+        'original_ops': original_ops,
+        'simplified_ops': 0,
+        'fused': 0,
+        'cancelled': 0,
+        'tunnels': 0,
+    }
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, numbers.Real) and not isinstance(value, bool)
+
+
+def _rule_operations(space) -> set:
+    """Operations the rewrite laws may be applied to"""
+    if space is None:
+        return set(_DEFAULT_HANDLERS)
+    handlers = space._operation_handlers
+    return {op for op, handler in _DEFAULT_HANDLERS.items() if handlers.get(op) is handler}
+
+
+# ========== REWRITE PASS ==========
+
+def _collapse_tunnels(ops: List[str], values: List[Any], start: Any, befores, stats) -> Tuple[Any, int]:
+    """
+    Find tunnels Y ⊙ X ⊘ Y⁻¹ whose Y is known
+
+    Returns:
+        (new start, index of the first step that is kept); everything
+        before the last tunnel is replaced by the start value X⁻¹
+    """
+    first = i = 0
+    while i + 1 < len(ops):
+        if befores is not None:
+            Y = befores[i]
+        elif i == first:
+            Y = start
+        else:
+            break
+        X, V = values[i], values[i + 1]
+        if (ops[i] == '⊙' and ops[i + 1] == '⊘' and _is_number(Y) and _is_number(X) and _is_number(V)
+                and X != 0 and Y != 0 and (V == 1.0 / Y or V * Y == 1)):
+            start = 1.0 / X
+            first = i = i + 2
+            stats['tunnels'] += 1
+        else:
+            i += 1
+    return start, first
+
+
+def simplify_steps(steps: List[Step], start: Any = None, befores: List[Any] = None,
+                   space=None) -> Tuple[Any, List[Step], Dict[str, int]]:
+    """
+    Simplify a list of (operation, value) steps
+
+    Args:
+        steps: Chain steps in order
+        start: Start value of the chain; if given, tunnels at the start
+            of the chain are collapsed (Y ⊙ X ⊘ Y⁻¹ -> start X⁻¹)
+        befores: Value before each step, if known (chain_value_before
+            along a chain path); tunnels are then collapsed anywhere
+        space: KMRChainSpace whose handlers decide which rules apply
+
+    Returns:
+        (start, simplified steps, statistics)
+    """
+    stats = _new_stats(len(steps))
+    if not steps:
+        return start, [], stats
+    rules = _rule_operations(space)
+    ops = list(map(operator.itemgetter(0), steps))
+    values = list(map(operator.itemgetter(1), steps))
+    op_set = set(ops)
+
+    # Arithmetic identities: + 0, - 0, * 1, / 1
+    identity_ops = op_set.intersection(_IDENTITY_PARAMETERS, rules)
+    if identity_ops:
+        keep = [not (op in identity_ops and _is_number(value) and value == _IDENTITY_PARAMETERS[op])
+                for op, value in zip(ops, values)]
+        stats['cancelled'] += keep.count(False)
+        ops, values = list(compress(ops, keep)), list(compress(values, keep))
+        if befores is not None:
+            befores = list(compress(befores, keep))
+
+    if not {'⊙', '⊘'} <= rules:
+        stats['simplified_ops'] = len(ops)
+        return start, list(zip(ops, values)), stats
+
+    start, first = _collapse_tunnels(ops, values, start, befores, stats)
+    if first:
+        ops, values = ops[first:], values[first:]
+
+    result: List[Step] = []
+    run: List[float] = []
+
+    def flush():
+        if not run:
+            return
+        K = math.fsum(run)
+        stats['fused'] += len(run) - 1
+        if K == 0:
+            stats['cancelled'] += len(run)
+        else:
+            result.append(('⊙', K))
+        run.clear()
+
+    if op_set <= _KMR_SIGNS.keys() and set(map(type, values)) <= _FAST_TYPES:
+        # A single run of plain numbers: fuse without a per-step Python loop
+        run.extend(map(operator.mul, map(_FAST_SIGNS.__getitem__, ops), values))
+    else:
+        for op, value in zip(ops, values):
+            if op in _KMR_SIGNS and _is_number(value):
+                run.append(_KMR_SIGNS[op] * value)
+            else:
+                flush()
+                result.append((op, value))
+    flush()
+
+    stats['simplified_ops'] = len(result)
+    return start, result, stats
+
+
+def simplify_chain(*elements: float) -> Tuple[Any, List[Step], Dict[str, int]]:
+    """
+    Simplify a compute_chain argument list A1 ⊙ A2 ⊙ ... ⊙ An
+
+    Returns:
+        (start, steps, statistics); the chain is start ⊙ fsum(A2..An)
+    """
+    if not elements:
+        return 0.0, [], _new_stats(0)
+    return simplify_steps([('⊙', element) for element in elements[1:]], elements[0])
+
+
+# ========== EVALUATION ==========
+
+def evaluate_steps(start: Any, steps: List[Step], space=None) -> Any:
+    """
+    Evaluate steps literally from a start value
+
+    Args:
+        start: Start value
+        steps: (operation, value) steps
+        space: Optional KMRChainSpace; all operations are then applied
+            through its handlers, as add_element does
+
+    Returns:
+        Chain value after the last step
+    """
+    value = start
+    if space is not None:
+        for op, parameter in steps:
+            value = space._apply_operation(value, op, parameter)
+        return value
+    for op, parameter in steps:
+        if op not in _DEFAULT_HANDLERS:
+            raise ValueError(f"Unknown operation: {op}")
+        value = _DEFAULT_HANDLERS[op](value, parameter)
+    return value
+
+
+def compute_chain_simplified(*elements: float) -> float:
+    """A1 ⊙ A2 ⊙ ... ⊙ An evaluated as A1 ⊙ fsum(A2, ..., An)"""
+    start, steps, _ = simplify_chain(*elements)
+    return evaluate_steps(start, steps)
+
+
+# ========== CHAIN SPACE PATHS ==========
+
+def chain_path(space, element_id: str) -> Tuple[Any, List[Step], List[str]]:
+    """
+    Collect the path from the root of a chain to an element
+
+    Returns:
+        (start value, steps, element IDs) in chain order
+    """
+    if element_id not in space.private_heap:
+        raise ValueError(f"Element {element_id[:16]}... not found")
+
+    ids = []
+    current = element_id
+    while current in space.private_heap:
+        ids.append(current)
+        current = space.private_heap[current].parent_id
+    ids.reverse()
+
+    start = space.private_heap[ids[0]].chain_value_before
+    steps = [(space.public_heap[i].operation, space.public_heap[i].value) for i in ids]
+    return start, steps, ids
+
+
+def simplify_chain_path(space, element_id: str) -> Tuple[Any, List[Step], Dict[str, int]]:
+    """Simplified (start, steps, statistics) of a KMRChainSpace chain path"""
+    start, steps, ids = chain_path(space, element_id)
+    befores = [space.private_heap[i].chain_value_before for i in ids]
+    return simplify_steps(steps, start, befores, space)
+
+
+def evaluate_chain_path(space, element_id: str, simplify: bool = True) -> Any:
+    """
+    Re-evaluate the chain ending at element_id from its root
+
+    Args:
+        space: KMRChainSpace instance
+        element_id: Last element of the path
+        simplify: Apply the rewrite pass before evaluation
+
+    Returns:
+        Chain value at element_id
+    """
+    if simplify:
+        start, steps, _ = simplify_chain_path(space, element_id)
+    else:
+        start, steps, _ = chain_path(space, element_id)
+    return evaluate_steps(start, steps, space)
+
+
+# ========== BENCHMARK ==========
+
+def benchmark_rewrite(n: int = 10000, chains: int = 20, seed: int = 0) -> Dict[str, Any]:
+    """
+    Compare literal and simplified evaluation of long mixed ⊙/⊘ chains
+
+    Accuracy is measured against the exact rational result.
+
+    Returns:
+        Dictionary with operation counts, timings and worst relative errors
+    """
+    import random
+    import time
+    from kmr_exact import exact_apply_operations
+
+    rng = random.Random(seed)
+    literal_time = simplified_time = 0.0
+    literal_err = simplified_err = 0.0
+    literal_ops = simplified_ops = 0
+
+    for _ in range(chains):
+        start = rng.uniform(0.5, 2.0)
+        steps = [(rng.choice('⊙⊘'), rng.uniform(0.0, 1.0)) for _ in range(n)]
+        exact = float(exact_apply_operations(start, steps))
+
+        t0 = time.perf_counter()
+        literal = evaluate_steps(start, steps)
+        t1 = time.perf_counter()
+        s_start, s_steps, stats = simplify_steps(steps, start)
+        simplified = evaluate_steps(s_start, s_steps)
+        t2 = time.perf_counter()
+
+        literal_time += t1 - t0
+        simplified_time += t2 - t1
+        literal_ops += stats['original_ops']
+        simplified_ops += stats['simplified_ops']
+        literal_err = max(literal_err, abs(literal - exact) / abs(exact))
+        simplified_err = max(simplified_err, abs(simplified - exact) / abs(exact))
+
+    return {
+        'n': n,
+        'chains': chains,
+        'literal_ops': literal_ops,
+        'simplified_ops': simplified_ops,
+        'literal_seconds': literal_time,
+        'simplified_seconds': simplified_time,
+        'literal_max_rel_error': literal_err,
+        'simplified_max_rel_error': simplified_err,
+    }
+
+
+if __name__ == "__main__":
+    print("=== KMR Chain Rewriting ===")
+    start, steps, stats = simplify_steps([('⊙', 2.0), ('⊘', 0.5), ('⊙', 0.5), ('+', 1.0), ('⊙', 3.0)], 1.0)
+    print(f"1 ⊙ 2 ⊘ 0.5 ⊙ 0.5 + 1 ⊙ 3  ->  start={start}, steps={steps}")
+    print(f"  {stats}")
+
+    start, steps, stats = simplify_steps([('⊙', 3.0), ('⊘', 0.5)], 2.0)
+    print(f"2 ⊙ 3 ⊘ 2⁻¹ (tunnel)  ->  start={start}, steps={steps}, tunnels={stats['tunnels']}")
+
+    from kmr_chains import KMRChainSpace
+    space = KMRChainSpace()
+    node = space.add_element('⊙', 2.0, chain_value_before=1.0)
+    node = space.add_element('⊙', 5.0, parent_id=node)
+    node = space.add_element('⊘', 1.0 / space.private_heap[node].chain_value_before, parent_id=node)
+    node = space.add_element('+', 1.0, parent_id=node)
+    start, steps, stats = simplify_chain_path(space, node)
+    print(f"Path 1 ⊙ 2 ⊙ 5 ⊘ (1/3)⁻¹ + 1 (tunnel mid-path)  ->  start={start}, steps={steps}, "
+          f"tunnels={stats['tunnels']}")
+    print(f"  evaluated {evaluate_chain_path(space, node)}, stored {space.get_chain_value(node)}")
+
+    print("\nLong mixed chains (accuracy against exact rational result):")
+    for n in (100, 1000, 10000):
+        r = benchmark_rewrite(n, chains=10)
+        print(f"  n={n:<6} ops {r['literal_ops']:>7} -> {r['simplified_ops']:<3} "
+              f"time {r['literal_seconds']:.4f}s -> {r['simplified_seconds']:.4f}s   "
+              f"max rel error {r['literal_max_rel_error']:.2e} -> {r['simplified_max_rel_error']:.2e}")
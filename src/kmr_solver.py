@@ -0,0 +1,224 @@
+# kmr_solver.py
+"""
+KMR Chain Solver - Recover several missing chain elements at once
+Version: 1.0.0
+License: GPL 3.0 (see LICENSE)
+Author: Sergei Terikhov
+
+In reciprocal space a ⊙/⊘ chain is a cumulative sum (Section 9.2):
+
+    R_0 = 1/start,   R_j = R_{j-1} + s_j·K_j,   s_j = +1 (⊙), -1 (⊘)
+
+where R_j = 1/(value after step j). Every observed value R_j fixes the
+sum of the terms since the previous observation, so the constraint matrix
+is block-diagonal: one all-ones row per segment between consecutive
+observations, and each unknown belongs to exactly one segment. The
+sparse system is therefore solved in closed form per segment:
+
+    one unknown in a segment      ->  determined exactly
+    several unknowns              ->  minimum-norm split (as lstsq),
+                                      reported as undetermined
+    no unknowns                   ->  consistency residual
+
+All chains of a batch are solved together with np.bincount over the
+segment ids.
+"""
+
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+from kmr_rewrite import chain_path
+
+_SIGNS = {'⊙': 1.0, '⊘': -1.0}
+
+
+def _signs(operations, shape) -> np.ndarray:
+    ops = np.asarray(operations)
+    signs = np.full(ops.shape, np.nan)
+    for op, sign in _SIGNS.items():
+        signs[ops == op] = sign
+    if np.any(np.isnan(signs)):
+        raise ValueError("Only ⊙ and ⊘ steps can be solved in reciprocal space")
+    return np.broadcast_to(signs, shape)
+
+
+# ========== BATCH SOLVER ==========
+
+def solve_chains_batch(starts, operations, values, observed) -> Dict[str, Any]:
+    """
+    Solve many chains of equal length for their missing elements
+
+    Args:
+        starts: Start values, shape (m,); NaN where unknown
+        operations: '⊙'/'⊘' per step, shape (n,) or (m, n)
+        values: Step parameters, shape (m, n); NaN where unknown
+        observed: Observed values after each step, shape (m, n);
+            NaN where not observed
+
+    Returns:
+        Dictionary with keys:
+            'starts': (m,) start values with unknowns filled in
+            'values': (m, n) parameters with unknowns filled in
+            'determined': (m, n + 1) True where column j (0 = start) is
+                known or uniquely recovered
+            'residuals': (m, n + 1) consistency residual of fully known
+                segments, stored at the observation that closes them
+    """
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    observed = np.atleast_2d(np.asarray(observed, dtype=float))
+    m, n = values.shape
+    starts = np.broadcast_to(np.asarray(starts, dtype=float), (m,))
+    signs = _signs(operations, (m, n))
+
+    with np.errstate(divide='ignore'):
+        # Columns 0..n: column 0 is R_0 = 1/start, column j the step j
+        terms = np.empty((m, n + 1))
+        terms[:, 0] = 1.0 / starts
+        terms[:, 1:] = signs * values
+        recips = np.empty((m, n + 1))
+        recips[:, 0] = 1.0 / starts
+        recips[:, 1:] = 1.0 / observed
+
+    known = ~np.isnan(terms)
+    obs = ~np.isnan(recips)
+
+    # Segment of column j: number of observations strictly before j
+    seg = np.cumsum(obs, axis=1) - obs
+    n_seg = n + 2
+    flat_seg = (seg + np.arange(m)[:, None] * n_seg).ravel()
+    size = m * n_seg
+
+    unknown_count = np.bincount(flat_seg, weights=(~known).ravel(), minlength=size)
+    known_sum = np.bincount(flat_seg, weights=np.where(known, terms, 0.0).ravel(), minlength=size)
+
+    # Right-hand side of segment k: R at its closing observation minus R at the previous one
+    # (segment 0 of each chain starts from R = 0)
+    obs_chain = np.nonzero(obs)[0]
+    closing = obs_chain * n_seg + seg[obs]
+    rhs = np.full(size, np.nan)
+    rhs[closing] = recips[obs]
+    previous = np.zeros(size)
+    previous[closing + 1] = recips[obs]
+    b = rhs - previous - known_sum
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        share = b / unknown_count
+    solved_terms = np.where(known, terms, share[flat_seg].reshape(m, n + 1))
+
+    seg_unknowns = unknown_count[flat_seg].reshape(m, n + 1)
+    constrained = ~np.isnan(rhs[flat_seg].reshape(m, n + 1))
+    determined = known | ((seg_unknowns == 1) & constrained)
+    solved_terms = np.where(known | constrained, solved_terms, np.nan)
+
+    residuals = np.zeros((m, n + 1))
+    closing_cols = obs & (seg_unknowns == 0)
+    residuals[closing_cols] = b[flat_seg.reshape(m, n + 1)[closing_cols]]
+
+    with np.errstate(divide='ignore'):
+        solved_starts = 1.0 / solved_terms[:, 0]
+    return {
+        'starts': solved_starts,
+        'values': solved_terms[:, 1:] * signs,
+        'determined': determined,
+        'residuals': residuals,
+    }
+
+
+def solve_chain(start: Optional[float], operations: Sequence[str],
+                values: Sequence[Optional[float]],
+                observed: Sequence[Optional[float]]) -> Dict[str, Any]:
+    """
+    Solve one chain start (op_1 K_1) ... (op_n K_n) for its missing elements
+
+    Args:
+        start: Start value, None if unknown
+        operations: '⊙'/'⊘' per step
+        values: Step parameters, None for unknowns
+        observed: Value after each step, None where not observed
+
+    Returns:
+        Dictionary with 'start', 'values', 'determined' (per step, start
+        first) and 'max_residual'
+    """
+    result = solve_chains_batch(
+        [np.nan if start is None else start],
+        list(operations),
+        [[np.nan if v is None else v for v in values]],
+        [[np.nan if v is None else v for v in observed]],
+    )
+    return {
+        'start': float(result['starts'][0]),
+        'values': result['values'][0].tolist(),
+        'determined': result['determined'][0].tolist(),
+        'max_residual': float(np.max(np.abs(result['residuals'][0]))),
+    }
+
+
+# ========== CHAIN SPACE PATHS ==========
+
+def _is_known(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and not np.isnan(value)
+
+
+def solve_chain_path(space, element_id: str, unknown_ids: Sequence[str] = ()) -> Dict[str, Any]:
+    """
+    Solve the path from the chain root to an element of a KMRChainSpace
+
+    Element values that are None/NaN (or listed in unknown_ids) are the
+    unknowns; every numeric chain_value_after on the path is an
+    observation, and the root chain_value_before is the start.
+
+    Returns:
+        Dictionary with 'element_ids', 'start', 'values', 'determined'
+        and 'max_residual' (see solve_chain)
+    """
+    start, _, ids = chain_path(space, element_id)
+    unknown_ids = set(unknown_ids)
+    operations = [space.public_heap[i].operation for i in ids]
+    values = [space.public_heap[i].value if i not in unknown_ids and _is_known(space.public_heap[i].value)
+              else None for i in ids]
+    observed = [space.private_heap[i].chain_value_after if _is_known(space.private_heap[i].chain_value_after)
+                else None for i in ids]
+
+    result = solve_chain(start if _is_known(start) else None, operations, values, observed)
+    result['element_ids'] = ids
+    return result
+
+
+if __name__ == "__main__":
+    import time
+    from kmr_mobius import chain_values_after
+
+    print("=== KMR Chain Solver ===")
+    # 2 ⊙ 3 ⊘ 0.5 ⊙ 4 ⊙ 1: values 2/7, 0.4, 0.16, 0.1379...
+    ops = ['⊙', '⊘', '⊙', '⊙']
+    truth = [3.0, 0.5, 4.0, 1.0]
+    after = chain_values_after(2.0, truth, ops)
+    result = solve_chain(2.0, ops, [3.0, None, None, 1.0], [None, after[1], after[2], None])
+    print(f"Missing K2, K3 with values after steps 2, 3 observed: {result['values']}")
+    print(f"  determined: {result['determined']}")
+    result = solve_chain(None, ops, [None, 0.5, None, 1.0], [after[0], None, None, after[3]])
+    print(f"Missing start, K1, K3: start={result['start']}, values={result['values']}")
+    print(f"  determined: {result['determined']}  (start and K1 share a segment)")
+
+    rng = np.random.default_rng(0)
+    m, n = 10_000, 50
+    starts = rng.uniform(0.5, 2.0, m)
+    ops = rng.choice(['⊙', '⊘'], n)
+    true_values = rng.uniform(0.01, 0.2, (m, n))
+    true_after = np.array([chain_values_after(s, v, ops) for s, v in zip(starts, true_values)])
+
+    values = true_values.copy()
+    observed = np.full((m, n), np.nan)
+    missing = rng.random((m, n)) < 0.3
+    values[missing] = np.nan
+    # Observe the value after every missing step
+    observed[missing] = true_after[missing]
+
+    start = time.perf_counter()
+    result = solve_chains_batch(starts, ops, values, observed)
+    elapsed = time.perf_counter() - start
+    err = np.max(np.abs(result['values'][missing] - true_values[missing]))
+    print(f"\n{m:,} chains × {n} steps, {int(missing.sum()):,} unknowns: solved in {elapsed:.3f} s, "
+          f"all determined: {bool(result['determined'].all())}, max abs error {err:.2e}")
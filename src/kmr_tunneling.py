@@ -8,8 +8,11 @@ Date: 08.12.2025
 """
 
 import math
-from typing import List, Optional, Union
-from kmr_operations import kmr_dircly, kmr_invly
+from typing import List, Optional, Tuple, Union
+import numpy as np
+from kmr_operations import kmr_dircly, kmr_invly, kmr_dircly_batch, kmr_invly_batch
+from kmr_power import kmr_extract_batch
+from kmr_rewrite import chain_path
 
 
 # ========== TUNNELING FUNCTIONS ==========
@@ -88,6 +91,88 @@ def create_tunneling_chain(chain_space, Y: float, X: float) -> str:
     return final_id
 
 
+def kmr_tunnel_transform_batch(Y, X) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Apply tunneling transformation Y ⊙ X ⊘ Y⁻¹ to arrays of pairs
+
+    Unlike kmr_tunnel_transform, undefined pairs do not raise; they are
+    reported in the error mask and set to NaN in the result.
+
+    Args:
+        Y: Tunneling parameters (array-like)
+        X: Input values (array-like, broadcastable with Y)
+
+    Returns:
+        (result, error_mask) arrays
+    """
+    Y, X = np.broadcast_arrays(np.asarray(Y, dtype=float), np.asarray(X, dtype=float))
+    zero_Y = Y == 0
+
+    with np.errstate(divide='ignore'):
+        Y_inv = np.where(zero_Y, np.nan, 1.0 / np.where(zero_Y, 1.0, Y))
+
+    # Y ⊙ X, then (Y ⊙ X) ⊘ Y⁻¹
+    Y_odot_X = kmr_dircly_batch(Y, X)
+    result = kmr_invly_batch(Y_odot_X, Y_inv)
+
+    error_mask = zero_Y | np.isnan(Y_odot_X) | np.isnan(result)
+    result = np.where(error_mask, np.nan, result)
+    return result, error_mask
+
+
+def create_tunneling_chains_bulk(chain_space, Y, X, shortcut: bool = None) -> List[str]:
+    """
+    Create many tunneling chains Y ⊙ X ⊘ Y⁻¹ in one pass
+
+    All three chain values of every pair are computed vectorized and
+    stored without per-step handler calls. The chains have the same
+    structure as those of create_tunneling_chain.
+
+    Args:
+        chain_space: KMRChainSpace instance
+        Y: Tunneling parameters (array-like)
+        X: Input values (array-like, broadcastable with Y)
+        shortcut: Store X⁻¹ as the final value directly (Section 11)
+            instead of evaluating the ⊘ Y⁻¹ step; defaults to the
+            space's tunneling_shortcut setting
+
+    Returns:
+        Element IDs of the final results, one per pair
+
+    Raises:
+        ValueError: If any tunneling parameter Y is zero (nothing is inserted)
+    """
+    Y, X = np.broadcast_arrays(np.asarray(Y, dtype=float), np.asarray(X, dtype=float))
+    Y, X = Y.ravel(), X.ravel()
+    if np.any(Y == 0):
+        raise ValueError(f"Tunneling parameter Y cannot be zero ({np.count_nonzero(Y == 0)} pairs)")
+
+    if shortcut is None:
+        shortcut = chain_space.tunneling_shortcut
+
+    Y_inv = 1.0 / Y
+    Y_odot_X = kmr_dircly_batch(Y, X)
+    if shortcut:
+        with np.errstate(divide='ignore'):
+            result = np.where(X == 0, kmr_invly_batch(Y_odot_X, Y_inv), 1.0 / np.where(X == 0, 1.0, X))
+        chain_space._count_tunneling_shortcuts(int(np.count_nonzero(X != 0)))
+    else:
+        result = kmr_invly_batch(Y_odot_X, Y_inv)
+
+    ids = chain_space._generate_ids(4 * Y.size)
+    records = []
+    for i, (y, x, y_inv, y_odot_x, r) in enumerate(zip(Y.tolist(), X.tolist(), Y_inv.tolist(),
+                                                        Y_odot_X.tolist(), result.tolist())):
+        root_id, start_id, y_odot_x_id, final_id = ids[4 * i:4 * i + 4]
+        records.append((start_id, root_id, '+', 0.0, y, y + 0.0))
+        records.append((y_odot_x_id, start_id, '⊙', x, y, y_odot_x))
+        records.append((final_id, y_odot_x_id, '⊘', y_inv, y_odot_x, r))
+    chain_space.add_evaluated_elements(records)
+
+    final_ids = ids[3::4]
+    return final_ids
+
+
 # ========== ELEMENT EXTRACTION FUNCTIONS ==========
 
 def extract_intermediate_element(X: float, left_chain: List[float], right_chain: List[float]) -> float:
@@ -276,6 +361,94 @@ def compute_chain(*elements: float) -> float:
     return result
 
 
+# ========== PARAMETER EXTRACTION ==========
+
+def kmr_extract_parameter(A, X, operation: str = '⊙'):
+    """
+    Recover the parameter K from an observed result (Section 10.2.2)
+
+    Formulas:
+        A ⊙ K = X  ->  K = 1/X - 1/A
+        A ⊘ K = X  ->  K = 1/A - 1/X
+
+    Both are the extraction operator E_A(X) = (X ⊘ A⁻¹)⁻¹ (Section 17.1),
+    evaluated by kmr_power.kmr_extract_batch; ⊘ negates it. X = ∞ (a
+    step on the pole) gives the pole parameter ∓1/A.
+
+    Args:
+        A: Values the operator was applied to (float or array-like)
+        X: Observed results (broadcastable with A)
+        operation: '⊙' or '⊘'
+
+    Returns:
+        K as a float for scalar inputs, otherwise an array;
+        NaN where A = 0, X = 0 or X is NaN
+    """
+    if operation not in ('⊙', '⊘'):
+        raise ValueError(f"Unsupported operation for parameter extraction: {operation}")
+
+    A_arr = np.asarray(A, dtype=float)
+    X_arr = np.asarray(X, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        K = np.where(np.isinf(X_arr), -1.0 / A_arr, kmr_extract_batch(A_arr, X_arr))
+    K = np.where((A_arr == 0) | (X_arr == 0), np.nan, K)
+    if operation == '⊘':
+        K = -K
+
+    if K.ndim == 0:
+        return float(K)
+    return K
+
+
+def extract_parameters_batch(before, after, operations) -> np.ndarray:
+    """
+    Recover the parameters of a trail of ⊙/⊘ steps from its values
+
+    Args:
+        before: chain_value_before of each step
+        after: chain_value_after of each step
+        operations: '⊙' or '⊘' per step (other operations give NaN)
+
+    Returns:
+        Array of recovered parameters
+    """
+    before = np.asarray(before, dtype=float)
+    after = np.asarray(after, dtype=float)
+    ops = np.asarray(operations)
+    direct = np.asarray(kmr_extract_parameter(before, after, '⊙'))
+    return np.where(ops == '⊙', direct, np.where(ops == '⊘', -direct, np.nan))
+
+
+def extract_chain_parameters(chain_space, element_id: str) -> dict:
+    """
+    Recover every parameter of the path from the chain root to an element
+    using only the private_heap chain_value_before/after trail
+
+    Args:
+        chain_space: KMRChainSpace instance
+        element_id: Last element of the path
+
+    Returns:
+        Dictionary with keys 'element_ids', 'operations', 'parameters'
+        (recovered, in chain order) and 'recorded' (public values)
+    """
+    _, _, ids = chain_path(chain_space, element_id)
+    private = [chain_space.private_heap[i] for i in ids]
+    public = [chain_space.public_heap[i] for i in ids]
+    operations = [p.operation for p in public]
+    numeric = [isinstance(p.chain_value_before, (int, float)) and
+               isinstance(p.chain_value_after, (int, float)) for p in private]
+    before = [p.chain_value_before if ok else np.nan for p, ok in zip(private, numeric)]
+    after = [p.chain_value_after if ok else np.nan for p, ok in zip(private, numeric)]
+
+    return {
+        'element_ids': ids,
+        'operations': operations,
+        'parameters': extract_parameters_batch(before, after, operations),
+        'recorded': [p.value for p in public],
+    }
+
+
 # ========== HELPER FUNCTIONS ==========
 
 def verify_extraction_formula(*elements: float) -> dict:
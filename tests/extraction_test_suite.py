@@ -17,9 +17,13 @@ from kmr_tunneling import (
     extract_last_element,
     extract_element_from_chain,
     compute_chain,
-    verify_extraction_formula
+    verify_extraction_formula,
+    kmr_extract_parameter,
+    extract_chain_parameters,
 )
 from kmr_operations import kmr_dircly, kmr_invly
+from kmr_chains import KMRChainSpace
+from kmr_solver import solve_chain, solve_chain_path
 
 
 class KMRExtractionTests:
@@ -334,6 +338,68 @@ class KMRExtractionTests:
         print(f"  Difference: {abs(A3_theoretical - A3_function):.2e}")
         print(f"  Match: {math.isclose(A3_theoretical, A3_function, rel_tol=1e-12)}")
 
+    def test_parameter_extraction(self) -> None:
+        """Test recovery of K from A ⊙ K = X and A ⊘ K = X (Section 10.2.2)"""
+        self.print_header("7. PARAMETER EXTRACTION")
+
+        print(f"\n{'Observation':<20} {'Extracted K':<25} {'Expected':<12} {'Status':<10}")
+        print("-" * 67)
+
+        cases = [
+            ("2 ⊙ K = 2/7", kmr_extract_parameter(2.0, kmr_dircly(2.0, 3.0)), 3.0),
+            ("2 ⊘ K = -2/5", kmr_extract_parameter(2.0, kmr_invly(2.0, 3.0), '⊘'), 3.0),
+            ("0.5 ⊙ K = 0.25", kmr_extract_parameter(0.5, 0.25), 2.0),
+            ("2 ⊙ K = ∞ (pole)", kmr_extract_parameter(2.0, float('inf')), -0.5),
+        ]
+        for desc, extracted, expected in cases:
+            status = "PASS" if math.isclose(extracted, expected, rel_tol=self.epsilon) else "FAIL"
+            print(f"{desc:<20} {extracted:<25.{self.precision}f} {expected:<12} {status:<10}")
+
+        batch = kmr_extract_parameter([2.0, 1.0, 4.0], [kmr_dircly(2.0, 3.0), kmr_dircly(1.0, 0.5), kmr_dircly(4.0, -0.1)])
+        print(f"\nBatch [2 ⊙ 3, 1 ⊙ 0.5, 4 ⊙ -0.1] -> K = {batch}")
+
+        # Whole-chain recovery from the private_heap trail
+        space = KMRChainSpace()
+        element_id = space.add_element('⊙', 3.0, chain_value_before=2.0)
+        element_id = space.add_element('⊘', 0.5, parent_id=element_id)
+        element_id = space.add_element('⊙', 4.0, parent_id=element_id)
+        element_id = space.add_element('⊘', 1.5, parent_id=element_id)
+        trail = extract_chain_parameters(space, element_id)
+        print(f"\nChain 2 ⊙ 3 ⊘ 0.5 ⊙ 4 ⊘ 1.5 recovered from chain values:")
+        for op, recovered, recorded in zip(trail['operations'], trail['parameters'], trail['recorded']):
+            print(f"  {op} {recovered:.{self.precision}f} (recorded {recorded})")
+
+    def test_multiple_unknowns(self) -> None:
+        """Test recovery of several missing elements from partial results"""
+        self.print_header("8. MULTIPLE UNKNOWN ELEMENTS")
+
+        # 2 ⊙ 3 ⊘ 0.5 ⊙ 4 ⊙ 1 with K2 and K3 missing
+        ops = ['⊙', '⊘', '⊙', '⊙']
+        after = []
+        value = 2.0
+        for op, K in zip(ops, [3.0, 0.5, 4.0, 1.0]):
+            value = kmr_dircly(value, K) if op == '⊙' else kmr_invly(value, K)
+            after.append(value)
+
+        result = solve_chain(2.0, ops, [3.0, None, None, 1.0], [None, after[1], after[2], None])
+        print(f"\nChain 2 ⊙ 3 ⊘ K2 ⊙ K3 ⊙ 1, values after steps 2 and 3 observed:")
+        print(f"  K2 = {result['values'][1]:.{self.precision}f} (expected 0.5)")
+        print(f"  K3 = {result['values'][2]:.{self.precision}f} (expected 4)")
+        print(f"  All determined: {all(result['determined'])}")
+
+        result = solve_chain(2.0, ops, [3.0, None, None, 1.0], [None, None, after[2], None])
+        print(f"Only the value after step 3 observed: determined = {result['determined']}")
+
+        # The same reconciliation on a KMRChainSpace path with missing values
+        space = KMRChainSpace()
+        element_id = space.add_evaluated_element('⊙', 3.0, 2.0, after[0])
+        element_id = space.add_evaluated_element('⊘', None, after[0], after[1], parent_id=element_id)
+        element_id = space.add_evaluated_element('⊙', None, after[1], after[2], parent_id=element_id)
+        element_id = space.add_evaluated_element('⊙', 1.0, after[2], None, parent_id=element_id)
+        result = solve_chain_path(space, element_id)
+        print(f"\nKMRChainSpace path: recovered {[round(v, 12) for v in result['values']]}, "
+              f"max residual {result['max_residual']:.2e}")
+
     def run_all_tests(self) -> None:
         """Run all extraction tests"""
         print("=" * 70)
@@ -348,6 +414,8 @@ class KMRExtractionTests:
             self.test_edge_cases,
             self.test_verification_function,
             self.test_theoretical_correctness,
+            self.test_parameter_extraction,
+            self.test_multiple_unknowns,
         ]
 
         for i, test in enumerate(tests, 1):
@@ -368,6 +436,8 @@ class KMRExtractionTests:
         print("   A_k = 1/(X ⊘ A_n ⊘ ... ⊘ A_{k+1}) - 1/(A1 ⊙ ... ⊙ A_{k-1})")
         print("4. ✅ Formula works for chains of ANY length (3, 4, 5, ...)")
         print("5. ✅ Non-associativity is handled by sequential computation")
+        print("6. ✅ Parameters: K = 1/X - 1/A (⊙), K = 1/A - 1/X (⊘)")
+        print("7. ✅ Several unknowns are solved per segment between observed results")
         print("\nImportant Note:")
         print("The old formula A_k = 1/(X ⊘ A_{k+1}) - 1/L only works when k = n-1")
         print("The corrected formula requires canceling ALL elements to the right.")
@@ -0,0 +1,295 @@
+# functional_test_suite.py
+"""
+KMR Functional Chains Test Suite
+Version: 1.0.0
+License: GPL 3.0
+Author: Sergei Terikhov
+
+Test suite for the functional extension: traced SymPy expressions
+(kmr_symbolic) are compared with the numeric evaluation of the same
+chains, and the safe expression compiler is checked for rejected syntax,
+bounded constant powers, caching and speed against the eval and sympy
+paths it replaced. Basic functions use NumPy for numbers and SymPy only
+for SymPy objects; the evaluation cache keys floats exactly.
+"""
+
+import math
+import sys
+import time
+from fractions import Fraction
+
+import numpy as np
+import sympy as sp
+
+from kmr_chains import KMRChainSpace
+from kmr_chains_operations_init import initialize_functional_operations
+from kmr_chains_operations_func import (FunctionRegistry, FunctionEvaluationCache, compile_expression,
+                                        _compile_expression, evaluate_function_chain_vectorized)
+from kmr_symbolic import trace_chain, compile_chain
+
+
+class KMRFunctionalTests:
+    """Test suite for KMR functional chains"""
+
+    def __init__(self):
+        self.rtol = 1e-12
+        self.grid = np.linspace(0.5, 3.0, 101)
+
+    def print_header(self, text: str, width: int = 70) -> None:
+        """Print formatted header"""
+        print("\n" + "=" * width)
+        print(f" {text.center(width - 2)} ")
+        print("=" * width)
+
+    def test_traced_vs_numeric(self) -> None:
+        """Test traced expressions against numeric evaluation of the chain"""
+        self.print_header("1. TRACED EXPRESSION VS NUMERIC EVALUATION")
+
+        space = initialize_functional_operations(KMRChainSpace())
+        chains = []
+
+        chains.append(("x + e", space.add_element('identity', 'x + e')))
+        base = space.add_element('identity', 'sin')
+        chains.append(("sin ⊙f E", space.add_element('⊙f', 'E', parent_id=base)))
+        base = space.add_element('identity', 'ln(x) * pi')
+        chains.append(("ln(x)·pi +f abs(x - e)", space.add_element('+f', 'abs(x - e)', parent_id=base)))
+        base = space.add_element('identity', 'exp')
+        chains.append(("exp ⊘f 0.1 ∘ (x^2 + e)",
+                       space.add_element('∘', 'x^2 + e', parent_id=space.add_element('⊘f', 0.1, parent_id=base))))
+        base = space.add_element('identity', 'asin(1/x) + tanh(x)')
+        chains.append(("asin(1/x) + tanh(x) *f sqrt", space.add_element('*f', 'sqrt', parent_id=base)))
+
+        print(f"\n{'Chain':<28} {'Free symbols':<14} {'Max rel diff':<16} {'Status':<10}")
+        print("-" * 70)
+        for description, element_id in chains:
+            expr = trace_chain(element_id, space)
+            with np.errstate(invalid='ignore'):
+                traced = compile_chain(element_id, space)['function'](self.grid)
+                numeric = evaluate_function_chain_vectorized(element_id, space, self.grid)['values']
+            free = ','.join(sorted(str(s) for s in expr.free_symbols))
+            finite = np.isfinite(numeric)
+            diff = np.max(np.abs(traced[finite] - numeric[finite]) / np.abs(numeric[finite]), initial=0.0)
+            same = np.array_equal(np.isfinite(traced), finite) and diff < self.rtol
+            status = "PASS" if same and expr.free_symbols == {sp.Symbol('x')} else "FAIL"
+            print(f"{description:<28} {free:<14} {diff:<16.2e} {status:<10}")
+
+        print(f"\nTraced 'x + e': {trace_chain(chains[0][1], space)}")
+
+    def test_compiler_whitelist(self) -> None:
+        """Test which expressions the safe compiler accepts"""
+        self.print_header("2. SAFE COMPILER WHITELIST")
+
+        rejected = [
+            "__import__('os')",
+            "x.real",
+            "x[0]",
+            "[x, 1]",
+            "lambda y: y",
+            "x if x else 1",
+            "x < 1",
+            "'text'",
+            "True",
+            "y + 1",
+            "open(x)",
+            "sin(x, 1)",
+            "sin(x=1)",
+            "np.sin(x)",
+        ]
+        print(f"\n{'Expression':<22} {'Result':<52} {'Status':<10}")
+        print("-" * 84)
+        for expr in rejected:
+            try:
+                compile_expression(expr)
+                result, status = "accepted", "FAIL"
+            except ValueError as e:
+                result, status = str(e), "PASS"
+            print(f"{expr:<22} {result[:50]:<52} {status:<10}")
+
+        accepted = [("x^2 + 1", 3.0, 10.0), ("2*pi*x", 0.5, math.pi), ("ln(x) + e", 1.0, math.e),
+                    ("-x % 3 + x // 2", 7.0, 5.0), ("abs(x - E)", 0.0, math.e)]
+        print(f"\n{'Expression':<22} {'x':<6} {'Value':<20} {'Expected':<20} {'Status':<10}")
+        print("-" * 80)
+        for expr, x, expected in accepted:
+            value = float(compile_expression(expr)(x))
+            status = "PASS" if math.isclose(value, expected, rel_tol=1e-15) else "FAIL"
+            print(f"{expr:<22} {x:<6} {value!r:<20} {expected!r:<20} {status:<10}")
+
+        # Constants are floats: a tower of powers overflows at once
+        print(f"\n{'Expression':<22} {'Outcome':<46} {'Time (s)':<10} {'Status':<10}")
+        print("-" * 90)
+        for expr in ("9**9**9**9", "2**10000000", "1" + "0" * 400):
+            start = time.perf_counter()
+            try:
+                outcome = repr(compile_expression(expr)(1.0))
+            except (ValueError, OverflowError) as e:
+                outcome = f"{type(e).__name__}: {str(e.args[-1])[:30]}"
+            elapsed = time.perf_counter() - start
+            status = "PASS" if elapsed < 0.1 else "FAIL"
+            print(f"{expr[:20]:<22} {outcome:<46} {elapsed:<10.5f} {status:<10}")
+
+    def test_compiler_cache(self) -> None:
+        """Test that compiled expressions are cached by text"""
+        self.print_header("3. COMPILE CACHE")
+
+        _compile_expression.cache_clear()
+        first = compile_expression("x**3 - x")
+        second = compile_expression("x**3 - x")
+        other = compile_expression("x**3 + x")
+        info = _compile_expression.cache_info()
+        print(f"\nSame text returns the same function: {first is second}")
+        print(f"Different text returns a new function: {first is not other}")
+        print(f"Cache after 3 calls: hits={info.hits}, misses={info.misses}, size={info.currsize}")
+        via_registry = FunctionRegistry.create_function("x**3 - x")
+        print(f"create_function reuses the cached function: {via_registry is first}")
+        explicit = compile_expression("x**3 - x", 'x')
+        print(f"Explicit var_name='x' shares the entry: {explicit is first}")
+
+    def test_compiler_speed(self) -> None:
+        """Compare the compiled function with the eval and sympy paths it replaced"""
+        self.print_header("4. COMPILER VS EVAL AND SYMPY")
+
+        expr = "x**2 + 2*x + 1"
+        calls = 10_000
+        points = np.linspace(-2.0, 2.0, calls).tolist()
+
+        def eval_path(text, var_name):
+            # The removed fallback: the string is parsed again on every call
+            return lambda x: eval(text, {'x': x, 'math': math})
+
+        def sympy_path(text, var_name):
+            x = sp.Symbol(var_name)
+            return sp.lambdify(x, sp.sympify(text), 'numpy')
+
+        uncached = _compile_expression.__wrapped__
+        print(f"\nExpression {expr!r}, {calls:,} scalar calls")
+        print(f"\n{'Path':<14} {'Create (ms)':<14} {'Per call (us)':<16} {'Total (ms)':<12}")
+        print("-" * 56)
+        totals = {}
+        for name, make in (("compiled", uncached), ("eval", eval_path), ("sympy", sympy_path)):
+            start = time.perf_counter()
+            func = make(expr, 'x')
+            created = time.perf_counter() - start
+            start = time.perf_counter()
+            for x in points:
+                func(x)
+            called = time.perf_counter() - start
+            totals[name] = created + called
+            print(f"{name:<14} {created * 1e3:<14.3f} {called / calls * 1e6:<16.2f} {totals[name] * 1e3:<12.2f}")
+
+        print(f"\nCompiled faster than eval: {totals['compiled'] < totals['eval']} "
+              f"({totals['eval'] / totals['compiled']:.0f}x)")
+        print(f"Compiled faster than sympy: {totals['compiled'] < totals['sympy']} "
+              f"({totals['sympy'] / totals['compiled']:.0f}x)")
+
+    def test_basic_function_scalars(self) -> None:
+        """Test that basic functions use NumPy for numbers and SymPy for SymPy objects"""
+        self.print_header("5. BASIC FUNCTIONS: NUMBERS VS SYMPY OBJECTS")
+
+        basic = FunctionRegistry.BASIC_FUNCTIONS
+        x = sp.Symbol('x')
+        with np.errstate(invalid='ignore'):
+            cases = [
+                ("log(-1)", basic['log'](-1), float('nan'), float),
+                ("sin(0.5)", basic['sin'](0.5), math.sin(0.5), float),
+                ("exp(np.float64(1))", basic['exp'](np.float64(1.0)), math.e, float),
+                ("log(Fraction(1, 2))", basic['log'](Fraction(1, 2)), math.log(0.5), float),
+                ("log(Integer(-1))", basic['log'](sp.Integer(-1)), sp.I * sp.pi, sp.Basic),
+                ("exp(Integer(0))", basic['exp'](sp.Integer(0)), sp.Integer(1), sp.Basic),
+                ("sin(pi)", basic['sin'](sp.pi), sp.Integer(0), sp.Basic),
+                ("cos(x)", basic['cos'](x), sp.cos(x), sp.Basic),
+            ]
+        print(f"\n{'Call':<22} {'Result':<22} {'Type':<10} {'Status':<10}")
+        print("-" * 64)
+        for description, result, expected, kind in cases:
+            if kind is float:
+                same = (math.isnan(expected) and math.isnan(result)) or result == expected
+            else:
+                same = result == expected
+            status = "PASS" if same and isinstance(result, kind) else "FAIL"
+            print(f"{description:<22} {str(result):<22} {type(result).__name__:<10} {status:<10}")
+
+        # Point-by-point fallback: the basic function gets NumPy scalars, a
+        # negative argument of log gives nan instead of a complex SymPy value
+        space = initialize_functional_operations(KMRChainSpace())
+        chain = space.add_element('+f', 'log', parent_id=space.add_element('identity', lambda v: math.cos(v)))
+        result = evaluate_function_chain_vectorized(chain, space, np.linspace(-2.0, 2.0, 5))
+        status = "PASS" if not result['vectorized'] and result['poles'].tolist() == [0, 1, 2] else "FAIL"
+        print(f"\ncos(x) + log(x) point by point on [-2, 2]: {result['values']}  {status}")
+
+    def test_evaluation_cache_keys(self) -> None:
+        """Test that the evaluation cache keys floats exactly"""
+        self.print_header("6. EVALUATION CACHE KEYS")
+
+        space = initialize_functional_operations(KMRChainSpace())
+        sign = space.add_element('identity', lambda v: math.copysign(1.0, v))
+        cache = FunctionEvaluationCache(space)
+
+        results = [cache.evaluate(sign, 0.0), cache.evaluate(sign, -0.0)]
+        status = "PASS" if results == [1.0, -1.0] else "FAIL"
+        print(f"\nsign(x) at 0.0 then -0.0: {results} (misses={cache.misses}, hits={cache.hits})  {status}")
+
+        with np.errstate(divide='ignore'):
+            recip = space.add_element('identity', 'reciprocal')
+            results = [float(cache.evaluate(recip, np.float64(0.0))), float(cache.evaluate(recip, np.float64(-0.0)))]
+        status = "PASS" if results == [np.inf, -np.inf] else "FAIL"
+        print(f"reciprocal at np.float64 0.0 then -0.0: {results}  {status}")
+
+        size, hits = len(cache._entries), cache.hits
+        values = [cache.evaluate(sign, float('nan')) for _ in range(3)]
+        status = "PASS" if cache.hits - hits == 2 and len(cache._entries) == size + 1 else "FAIL"
+        print(f"sign(x) at NaN three times: {cache.hits - hits} hits, "
+              f"{len(cache._entries) - size} new entry, values {values}  {status}")
+
+    def run_all_tests(self) -> None:
+        """Run all functional chain tests"""
+        print("=" * 70)
+        print(" KMR FUNCTIONAL CHAINS TEST SUITE ".center(70))
+        print("=" * 70)
+
+        tests = [
+            self.test_traced_vs_numeric,
+            self.test_compiler_whitelist,
+            self.test_compiler_cache,
+            self.test_compiler_speed,
+            self.test_basic_function_scalars,
+            self.test_evaluation_cache_keys,
+        ]
+
+        for i, test in enumerate(tests, 1):
+            try:
+                test()
+                print(f"\n✅ Test {i} completed successfully")
+            except Exception as e:
+                print(f"\n❌ Error in test {i}: {e}")
+                import traceback
+                traceback.print_exc()
+
+        self.print_header("TEST SUMMARY")
+        print("\n✅ All functional chain tests completed!")
+        print("\nKey Findings:")
+        print("1. String parameters are traced with the safe compiler's names (e, E, pi, ln, abs)")
+        print("2. The compiler rejects every node outside the arithmetic whitelist")
+        print("3. Constants are floats, so powers of constants cannot grow unbounded integers")
+        print("4. Compiled functions are cached and beat the eval and sympy paths")
+        print("5. Basic functions use NumPy for numbers and arrays, SymPy only for SymPy objects")
+        print("6. The evaluation cache tells 0.0 from -0.0 and reuses NaN entries")
+
+
+def main():
+    """Main function to run the functional chain test suite"""
+    try:
+        test_suite = KMRFunctionalTests()
+        test_suite.run_all_tests()
+        return 0
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Test suite interrupted by user")
+        return 1
+    except Exception as e:
+        print(f"\n❌ Unexpected error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
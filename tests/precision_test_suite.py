@@ -0,0 +1,436 @@
+# precision_test_suite.py
+"""
+KMR Precision Test Suite
+Version: 1.0.0
+License: GPL 3.0
+Author: Sergei Terikhov
+
+Test suite for pole-safe, interval and adaptive-precision evaluation
+for the pole locator index, for reverse-mode chain gradients, for the
+exact rational backend and for K-flow trajectories.
+Compares each backend with exact rational results.
+"""
+
+import sys
+import math
+from fractions import Fraction
+
+import numpy as np
+
+import kmr_operations as kmr
+from kmr_tunneling import compute_chain
+from kmr_projective import (
+    compute_chain_projective,
+    compute_chain_safe,
+    extract_first_element_projective,
+    extract_last_element_projective,
+    extract_intermediate_element_projective,
+)
+from kmr_interval import (
+    interval_dircly,
+    interval_invly,
+    interval_add,
+    interval_sub,
+    compute_chain_interval,
+    compute_chain_interval_batch,
+    is_tight,
+    tight_mask,
+)
+from kmr_adaptive import adaptive_add, adaptive_sub, adaptive_compute_chain, escalation_report
+from kmr_poles import pole_index, pole_index_chain, pole_index_space, evaluate_indexed
+from kmr_projective import proj_dircly, from_projective
+from kmr_chains import KMRChainSpace
+from kmr_gradient import compute_chain_gradient, chain_gradient, chain_gradient_batch, chain_path_gradient
+from kmr_exact import (
+    exact_compute_chain,
+    exact_apply_operations,
+    exact_verify_extraction,
+    benchmark_exact_verification,
+    initialize_exact_operations,
+)
+from kmr_flow import flow_trajectory, flow_interpolate, pole_parameters
+
+
+def exact_chain(*elements: float) -> Fraction:
+    """Exact A1 ⊙ ... ⊙ An over the float inputs"""
+    x = Fraction(elements[0])
+    for element in elements[1:]:
+        x = x / (1 + Fraction(element) * x)
+    return x
+
+
+class KMRPrecisionTests:
+    """Test suite for KMR precision backends"""
+
+    def __init__(self):
+        self.precision = 15
+        self.epsilon = 1e-12
+
+    def print_header(self, text: str, width: int = 70) -> None:
+        """Print formatted header"""
+        print("\n" + "=" * width)
+        print(f" {text.center(width - 2)} ")
+        print("=" * width)
+
+    def test_projective_through_poles(self) -> None:
+        """Test chains that pass through an intermediate pole"""
+        self.print_header("1. PROJECTIVE EVALUATION THROUGH POLES")
+
+        test_cases = [
+            ((1.0, -1.0, 2.0), 0.5, "Pole at step 2"),
+            ((2.0, -0.5, 4.0, 1.0), 0.2, "Pole at step 2, long"),
+            ((2.0, 3.0, 4.0), float(exact_chain(2.0, 3.0, 4.0)), "No pole"),
+        ]
+
+        print(f"\n{'Description':<25} {'compute_chain':<20} {'Projective':<25} {'Expected':<25} {'Status':<10}")
+        print("-" * 105)
+
+        for elements, expected, desc in test_cases:
+            classic = compute_chain(*elements)
+            result = compute_chain_safe(*elements)
+            status = "PASS" if math.isclose(result, expected, rel_tol=self.epsilon) else "FAIL"
+            print(f"{desc:<25} {classic:<20.6f} {result:<25.{self.precision}f} "
+                  f"{expected:<25.{self.precision}f} {status:<10}")
+
+        print(f"\nPair for 1 ⊙ -1: {compute_chain_projective(1.0, -1.0)}  (point at infinity)")
+
+        # Extraction with a pole in the known part of the chain
+        elements = (1.0, -1.0, 2.0, 4.0)
+        X = compute_chain_safe(*elements)
+        print(f"\nExtraction from X = 1 ⊙ -1 ⊙ 2 ⊙ 4 = {X:.{self.precision}f}")
+        print(f"  A1 = {extract_first_element_projective(X, -1.0, 2.0, 4.0):.{self.precision}f} (expected 1)")
+        print(f"  A3 = {extract_intermediate_element_projective(X, [1.0, -1.0], [4.0]):.{self.precision}f} (expected 2)")
+        print(f"  A4 = {extract_last_element_projective(X, 1.0, -1.0, 2.0):.{self.precision}f} (expected 4)")
+
+    def test_interval_enclosures(self) -> None:
+        """Test that interval results enclose the exact values"""
+        self.print_header("2. INTERVAL ENCLOSURES")
+
+        print(f"\n{'Operation':<25} {'Lower':<25} {'Upper':<25} {'Encloses':<10}")
+        print("-" * 85)
+
+        cases = [
+            ("2 ⊙ 3", interval_dircly(2.0, 3.0), Fraction(2) / 7),
+            ("2 ⊘ 3", interval_invly(2.0, 3.0), Fraction(-2, 5)),
+            ("2 ⊙ 3 ⊙ 4 ⊙ 5", compute_chain_interval(2, 3, 4, 5), exact_chain(2, 3, 4, 5)),
+            ("kmr_add(0.1, 3, 2)", interval_add(0.1, 3.0, 2.0), Fraction(5)),
+            ("kmr_sub(0.1, 3, 2)", interval_sub(0.1, 3.0, 2.0), Fraction(1)),
+            ("kmr_add(1e-12, 3, 2)", interval_add(1e-12, 3.0, 2.0), Fraction(5)),
+        ]
+        for desc, (lo, hi), exact in cases:
+            encloses = lo <= exact <= hi
+            print(f"{desc:<25} {lo:<25.{self.precision}f} {hi:<25.{self.precision}f} {str(encloses):<10}")
+
+        print(f"\n1 ⊘ 1 (pole): {interval_invly(1.0, 1.0)}")
+        print(f"kmr_add(0.1, 3, 2) tight:   {is_tight(interval_add(0.1, 3.0, 2.0))}")
+        print(f"kmr_add(1e-12, 3, 2) tight: {is_tight(interval_add(1e-12, 3.0, 2.0))}")
+
+        # Batched enclosures against exact values
+        rng = np.random.default_rng(42)
+        chains = rng.uniform(0.1, 5.0, size=(200, 10))
+        lo, hi = compute_chain_interval_batch(chains)
+        enclosed = sum(lo[i] <= exact_chain(*chains[i]) <= hi[i] for i in range(len(chains)))
+        print(f"\nBatch of {len(chains)} chains: {enclosed} enclosed, "
+              f"{int(tight_mask(lo, hi).sum())} tight")
+
+    def test_adaptive_escalation(self) -> None:
+        """Test that only ill-conditioned elements are escalated"""
+        self.print_header("3. ADAPTIVE PRECISION ESCALATION")
+
+        A_values = np.array([1.0, 0.5, 0.1, 1e-6, 1e-12])
+        K, C = 3.0, 2.0
+
+        add_result = adaptive_add(A_values, K, C)
+        sub_result = adaptive_sub(A_values, K, C)
+
+        print(f"\n{'A':<12} {'kmr_add':<25} {'adaptive_add':<25} {'adaptive_sub':<25} {'Escalated':<10}")
+        print("-" * 97)
+        for i, A in enumerate(A_values):
+            print(f"{A:<12.0e} {kmr.kmr_add(A, K, C):<25.{self.precision}f} "
+                  f"{add_result['values'][i]:<25.{self.precision}f} "
+                  f"{sub_result['values'][i]:<25.{self.precision}f} "
+                  f"{str(bool(add_result['escalated'][i])):<10}")
+        print(f"\nadaptive_add: {escalation_report(add_result)}")
+
+        # Scalar inputs, the usual way kmr_add / kmr_sub are called
+        print(f"\n{'Scalar call':<28} {'Value':<22} {'Expected':<22} {'Escalated':<10} {'Status':<10}")
+        print("-" * 92)
+        for name, func, A, expected in (("adaptive_add(1, 3, 2)", adaptive_add, 1.0, kmr.kmr_add(1.0, K, C)),
+                                        ("adaptive_sub(0.5, 3, 2)", adaptive_sub, 0.5, kmr.kmr_sub(0.5, K, C)),
+                                        ("adaptive_add(1e-12, 3, 2)", adaptive_add, 1e-12, K + C)):
+            result = func(A, K, C)
+            ok = isinstance(result['values'], float) and abs(result['values'] - expected) <= 1e-12 * abs(expected)
+            print(f"{name:<28} {result['values']!r:<22} {expected!r:<22} {str(result['escalated']):<10} "
+                  f"{'PASS' if ok else 'FAIL':<10}")
+
+        rng = np.random.default_rng(7)
+        chains = rng.uniform(0.1, 5.0, size=(500, 12))
+        result = adaptive_compute_chain(chains)
+        max_err = max(abs(result['values'][i] - float(exact_chain(*chains[i]))) /
+                      abs(float(exact_chain(*chains[i]))) for i in range(len(chains)))
+        print(f"compute_chain batch: {escalation_report(result)}, max rel error = {max_err:.2e}")
+
+    def test_pole_index(self) -> None:
+        """Test that the pole index finds exactly the steps kmr_direct_sh rejects"""
+        self.print_header("4. POLE LOCATOR INDEX")
+
+        rng = np.random.default_rng(11)
+        A = rng.integers(-8, 9, 100_000) / 4.0
+        K = rng.integers(-8, 9, 100_000) / 4.0
+        index = pole_index(A, K)
+        scalar_nan = np.array([math.isnan(kmr.kmr_dircly(a, k)) for a, k in zip(A.tolist(), K.tolist())])
+        print(f"\nBatch of {A.size}: {index['count']} near-pole pairs, "
+              f"matches kmr_dircly NaNs: {np.array_equal(index['mask'], scalar_nan)}")
+
+        # Route indexed steps to the projective path: poles become ∞
+        safe = evaluate_indexed([2.0, 3.0], [-0.5, 1.0],
+                                safe=lambda a, k, s: np.array([from_projective(proj_dircly(x, y))
+                                                               for x, y in zip(a, k)]))
+        print(f"2 ⊙ -0.5, 3 ⊙ 1 with projective safe path: {safe}")
+
+        chain = pole_index_chain(1.0, [-1.0, 2.0, 4.0, -0.25])
+        print(f"Chain 1 ⊙ -1 ⊙ 2 ⊙ 4 ⊙ -0.25: near-pole steps {chain['indices']} (expected [0])")
+
+        # Planned chains: the index must flag exactly the step add_element turns into NaN
+        rng = np.random.default_rng(5)
+        matches = with_pole = 0
+        chains = 2000
+        for _ in range(chains):
+            start = float(rng.integers(1, 9)) / 4.0
+            values = (rng.integers(-8, 9, 8) / 4.0).tolist()
+            ops = rng.choice(['⊙', '⊘'], 8).tolist()
+            space = KMRChainSpace()
+            node, nan_steps = None, []
+            for i, (op, value) in enumerate(zip(ops, values)):
+                node = space.add_element(op, value, parent_id=node, chain_value_before=start if node is None else None)
+                if math.isnan(space.private_heap[node].chain_value_after):
+                    nan_steps.append(i)
+            with_pole += bool(nan_steps)
+            matches += pole_index_chain(start, values, ops)['indices'].tolist() == nan_steps[:1]
+        print(f"{chains} planned chains ({with_pole} hit a pole): index matches the first add_element NaN "
+              f"in {matches}")
+
+        space = KMRChainSpace()
+        root = space.add_element('⊙', 2.0, chain_value_before=1.0)
+        pole = space.add_element('⊙', -3.0, parent_id=root)
+        space.add_element('⊙', 3.0, parent_id=root)
+        result = pole_index_space(space)
+        print(f"KMRChainSpace: {result['count']} of {result['scanned']} steps near a pole, "
+              f"found the ⊙ -3 step: {result['element_ids'] == [pole]}")
+
+        # Any real number type is indexed; bool is not a step parameter
+        space = KMRChainSpace()
+        poles = [space.add_element('⊙', np.float32(-0.5), chain_value_before=2.0),
+                 space.add_element('⊙', Fraction(-1, 2), chain_value_before=2.0)]
+        space.add_element('⊙', True, chain_value_before=-1.0)
+        result = pole_index_space(space)
+        print(f"np.float32, Fraction and bool parameters: {result['scanned']} of 3 scanned, "
+              f"both real-typed poles found: {sorted(result['element_ids']) == sorted(poles)}")
+
+    def test_chain_gradients(self) -> None:
+        """Test reverse-mode gradients against exact and finite-difference derivatives"""
+        self.print_header("5. CHAIN GRADIENTS (SECTION 9.3)")
+
+        # Exact: ∂X/∂A1 = X²/A1², ∂X/∂A_k = -X² for k ≥ 2
+        elements = (0.7, 1.3, 2.9, 0.1, 5.5)
+        result = compute_chain_gradient(*elements)
+        X = exact_chain(*elements)
+        exact = [X ** 2 / Fraction(elements[0]) ** 2] + [-X ** 2] * (len(elements) - 1)
+        err = max(abs(float((Fraction(g) - e) / e)) for g, e in zip(result['gradient'], exact))
+        print(f"\nA1 ⊙ ... ⊙ A5 gradient vs exact rational: max rel error = {err:.2e} "
+              f"{'PASS' if err < self.epsilon else 'FAIL'}")
+
+        ops = ['⊙', '*', '⊘', '+', '/', '-']
+        values = [0.5, 3.0, 0.2, -1.0, 4.0, 0.3]
+        result = chain_gradient(1.5, ops, values)
+        h = 1e-6
+        fd = []
+        for k in range(len(values)):
+            up, down = list(values), list(values)
+            up[k] += h
+            down[k] -= h
+            fd.append((chain_gradient(1.5, ops, up)['value'] - chain_gradient(1.5, ops, down)['value']) / (2 * h))
+        err = np.max(np.abs(result['d_values'] - np.array(fd)))
+        print(f"Mixed chain ⊙ * ⊘ + / -: max abs difference to central differences = {err:.2e} "
+              f"{'PASS' if err < 1e-8 else 'FAIL'}")
+
+        space = KMRChainSpace()
+        node = space.add_element('⊙', 2.0, chain_value_before=1.0)
+        node = space.add_element('mul', 3.0, parent_id=node)
+        node = space.add_element('invly', 0.25, parent_id=node)
+        path = chain_path_gradient(space, node)
+        print(f"KMRChainSpace path 1 ⊙ 2 * 3 ⊘ 0.25: value {path['value']!r}, "
+              f"∂/∂start {path['d_start']!r}, ∂/∂K {path['d_values']}")
+
+        rng = np.random.default_rng(13)
+        starts = rng.uniform(0.5, 2.0, 500)
+        batch_ops = rng.choice(['⊙', '⊘'], (500, 200))
+        batch_values = rng.uniform(0.0, 0.01, (500, 200))
+        batch = chain_gradient_batch(starts, batch_ops, batch_values)
+        expected = np.where(batch_ops == '⊙', -1.0, 1.0) * batch['values'][:, None] ** 2
+        err = np.max(np.abs(batch['d_values'] - expected) / np.abs(expected))
+        print(f"Batch of 500 mixed chains × 200 steps: max rel error vs ∓X² = {err:.2e}")
+
+        pole = chain_gradient(1.0, ['⊙', '⊙'], [-1.0, 2.0])
+        print(f"Chain through a pole: value {pole['value']}, gradient {pole['d_values']}")
+
+    def test_exact_backend(self) -> None:
+        """Test the exact rational backend against plain Fraction loops"""
+        self.print_header("6. EXACT RATIONAL BACKEND")
+
+        rng = np.random.default_rng(17)
+        print(f"\n{'Check':<54} {'Cases':<8} {'Status':<10}")
+        print("-" * 74)
+
+        chains = [[Fraction(int(p), int(q)) for p, q in zip(rng.integers(-40, 41, 60), rng.integers(1, 41, 60))]
+                  for _ in range(200)]
+        matches = 0
+        for chain in chains:
+            try:
+                expected = exact_chain(*chain)
+            except ZeroDivisionError:
+                expected = None
+            for normalize_every in (1, 7, 16, 1000):
+                try:
+                    result = exact_compute_chain(*chain, normalize_every=normalize_every)
+                except ValueError:
+                    result = None
+                matches += result == expected
+        print(f"{'exact_compute_chain == Fraction loop (4 gcd periods)':<54} {4 * len(chains):<8} "
+              f"{'PASS' if matches == 4 * len(chains) else 'FAIL':<10}")
+
+        matches = 0
+        for _ in range(200):
+            start = Fraction(int(rng.integers(1, 20)), int(rng.integers(1, 20)))
+            steps = [(str(op), Fraction(int(p), int(q))) for op, p, q in
+                     zip(rng.choice(['⊙', '⊘'], 30), rng.integers(1, 30, 30), rng.integers(1, 30, 30))]
+            x = start
+            try:
+                for op, K in steps:
+                    if x != 0:
+                        x = x / (1 + K * x) if op == '⊙' else x / (1 - K * x)
+            except ZeroDivisionError:
+                x = None
+            try:
+                result = exact_apply_operations(start, steps)
+            except ValueError:
+                result = None
+            matches += result == x
+        print(f"{'exact_apply_operations (mixed ⊙/⊘) == Fraction':<54} {200:<8} "
+              f"{'PASS' if matches == 200 else 'FAIL':<10}")
+
+        verified = exact_verify_extraction(0.1, 0.2, 0.3, Fraction(7, 3), 5)
+        ok = all(r.get('success') for r in verified.values())
+        print(f"{'Extraction of every element recovers it exactly':<54} {len(verified):<8} "
+              f"{'PASS' if ok else 'FAIL':<10}")
+
+        try:
+            exact_compute_chain(1, -1, 2)
+            pole = "no error"
+        except ValueError as e:
+            pole = str(e)
+        print(f"\n1 ⊙ -1 ⊙ 2: {pole}")
+
+        space = initialize_exact_operations(KMRChainSpace())
+        node = space.add_element('⊙q', Fraction(1, 3), chain_value_before=Fraction(1, 2))
+        node = space.add_element('exact_inverse', 2, parent_id=node)
+        print(f"KMRChainSpace 1/2 ⊙q 1/3 ⊘q 2 = {space.get_chain_value(node)} (expected 3)")
+
+        result = benchmark_exact_verification(2000, repeats=1)
+        print(f"Verification of a 2000-element chain: {result['speedup']:.1f}x faster than the Fraction loop")
+
+    def test_flow_trajectories(self) -> None:
+        """Test K-trajectories and dense output against sequential kmr_dircly / kmr_invly"""
+        self.print_header("7. K-FLOW TRAJECTORIES")
+
+        rng = np.random.default_rng(1)
+        # A = 2 and A = -0.5 put exact poles on the grid (K = -0.5 for ⊙, K = 2 for ⊘ with A = 0.5)
+        A = np.concatenate(([2.0, -0.5, 0.5, 0.0], rng.uniform(-2.0, 2.0, 196)))
+        K = np.linspace(-4.0, 4.0, 161)
+        K_dense = np.linspace(-4.0, 4.0, 1237)
+        eps = np.finfo(float).eps
+
+        print(f"\n{'Op':<4} {'Grid vs scalar':<16} {'NaN match':<11} {'Max rel error':<15} "
+              f"{'Max err / ε·κ':<15} {'|K - pole| > 0.1':<18} {'Status':<10}")
+        print("-" * 95)
+        for op, scalar_op in (('⊙', kmr.kmr_dircly), ('⊘', kmr.kmr_invly)):
+            traj = flow_trajectory(A, K, op)
+            scalar = np.array([[scalar_op(a, k) for k in K.tolist()] for a in A.tolist()])
+            grid_same = np.array_equal(traj['values'], scalar, equal_nan=True)
+
+            dense = flow_interpolate(traj, K_dense)
+            exact = np.array([[scalar_op(a, k) for k in K_dense.tolist()] for a in A.tolist()])
+            nan_match = np.array_equal(np.isnan(dense), np.isnan(exact))
+
+            finite = np.isfinite(exact) & (exact != 0)
+            rel_error = np.abs(dense[finite] - exact[finite]) / np.abs(exact[finite])
+            with np.errstate(divide='ignore'):
+                kappa = ((1.0 / np.abs(A))[:, None] + np.abs(K_dense)[None, :])[finite] * np.abs(exact[finite])
+            ratio = np.max(rel_error / (eps * kappa))
+            far = (np.abs(K_dense[None, :] - pole_parameters(A, op)[:, None]) > 0.1)[finite]
+            far_error = np.max(rel_error[far])
+
+            status = "PASS" if grid_same and nan_match and ratio < 8 and far_error < 1e-13 else "FAIL"
+            print(f"{op:<4} {str(grid_same):<16} {str(nan_match):<11} {np.max(rel_error):<15.2e} "
+                  f"{ratio:<15.2f} {far_error:<18.2e} {status:<10}")
+
+        traj = flow_trajectory([-0.5], K)
+        cell = np.flatnonzero(traj['pole_cells'][0])
+        print(f"\n-0.5 ⊙ K: pole {traj['pole'][0]}, pole cells between K = {K[cell[0]]:.2f} and {K[cell[-1] + 1]:.2f}, "
+              f"derivative matches -y²: {np.allclose(traj['derivative'], -traj['values'] ** 2, equal_nan=True)}")
+
+    def run_all_tests(self) -> None:
+        """Run all precision tests"""
+        print("=" * 70)
+        print(" KMR PRECISION TEST SUITE ".center(70))
+        print("=" * 70)
+
+        tests = [
+            self.test_projective_through_poles,
+            self.test_interval_enclosures,
+            self.test_adaptive_escalation,
+            self.test_pole_index,
+            self.test_chain_gradients,
+            self.test_exact_backend,
+            self.test_flow_trajectories,
+        ]
+
+        for i, test in enumerate(tests, 1):
+            try:
+                test()
+                print(f"\n✅ Test {i} completed successfully")
+            except Exception as e:
+                print(f"\n❌ Error in test {i}: {e}")
+                import traceback
+                traceback.print_exc()
+
+        self.print_header("TEST SUMMARY")
+        print("\n✅ All precision tests completed!")
+        print("\nKey Findings:")
+        print("1. Projective pairs carry chains through intermediate poles")
+        print("2. Interval results enclose the exact rational values")
+        print("3. Only ill-conditioned elements (small A) are re-evaluated exactly")
+        print("4. Near-pole steps are located in one vectorized pass before evaluation")
+        print("5. All partial derivatives of a chain cost one forward and one reverse pass")
+        print("6. The exact backend matches Fraction arithmetic with periodic gcd normalization")
+        print("7. Dense K-flow output stays within a few ulps times the condition number of A ⊙ K")
+
+
+def main():
+    """Main function to run the precision test suite"""
+    try:
+        test_suite = KMRPrecisionTests()
+        test_suite.run_all_tests()
+        return 0
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Test suite interrupted by user")
+        return 1
+    except Exception as e:
+        print(f"\n❌ Unexpected error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
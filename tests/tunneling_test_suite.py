@@ -9,14 +9,23 @@ Test suite for KMR tunneling operations through KMRChainSpace.
 Compares tunneling results with algebraic expectations.
 """
 
+import gc
 import sys
 import math
 from typing import List, Tuple, Dict, Any
 
+import numpy as np
+
 # Import KMR modules
 import kmr_operations as kmr
 from kmr_chains import KMRChainSpace, add_element, get_chain_value, check_consistency, get_element
-from kmr_tunneling import kmr_tunnel_transform, create_tunneling_chain
+from kmr_tunneling import (
+    kmr_tunnel_transform,
+    create_tunneling_chain,
+    kmr_tunnel_transform_batch,
+    create_tunneling_chains_bulk,
+)
+from kmr_rewrite import simplify_steps, simplify_chain_path, evaluate_chain_path, benchmark_rewrite
 
 
 class KMRTunnelingTests:
@@ -371,6 +380,224 @@ class KMRTunnelingTests:
                 print(f"    Public: op={public.operation}, value={public.value}")
                 print(f"    Private: before={private.chain_value_before}, after={private.chain_value_after}")
 
+    def test_batched_tunneling(self) -> None:
+        """Test batched tunneling transform and bulk tunneling-chain builder"""
+        self.print_header("7. BATCHED TUNNELING")
+
+        Y = [2.0, 0.5, 3.0, -2.0, 0.0, 1.0]
+        X = [3.0, 4.0, 0.5, 3.0, 1.0, -1.0]
+
+        results, errors = kmr_tunnel_transform_batch(Y, X)
+
+        print(f"\n{'Y':<10} {'X':<10} {'Batch Result':<25} {'Scalar Result':<25} {'Error':<10}")
+        print("-" * 80)
+
+        for y, x, result, error in zip(Y, X, results, errors):
+            try:
+                scalar = f"{kmr_tunnel_transform(y, x):.{self.precision}f}"
+            except ValueError:
+                scalar = "ERROR"
+            print(f"{y:<10.3f} {x:<10.3f} {result:<25.{self.precision}f} {scalar:<25} {str(bool(error)):<10}")
+
+        # Bulk chain builder against per-pair chains
+        self.chain_space.clear()
+        valid_Y = [y for y, e in zip(Y, errors) if not e]
+        valid_X = [x for x, e in zip(X, errors) if not e]
+        bulk_ids = create_tunneling_chains_bulk(self.chain_space, valid_Y, valid_X)
+        single_ids = [create_tunneling_chain(self.chain_space, y, x) for y, x in zip(valid_Y, valid_X)]
+
+        print(f"\n{'Y':<10} {'X':<10} {'Bulk Chain':<25} {'Single Chain':<25} {'Consistency':<10}")
+        print("-" * 80)
+        for y, x, bulk_id, single_id in zip(valid_Y, valid_X, bulk_ids, single_ids):
+            print(f"{y:<10.3f} {x:<10.3f} {self.chain_space.get_chain_value(bulk_id):<25.{self.precision}f} "
+                  f"{self.chain_space.get_chain_value(single_id):<25.{self.precision}f} "
+                  f"{str(self.chain_space.check_consistency(bulk_id)):<10}")
+
+        print(f"\nElements in chain space: {len(self.chain_space.public_heap)} "
+              f"(3 per chain, {len(bulk_ids) + len(single_ids)} chains)")
+
+        # A duplicate ID anywhere in a batch is rejected before any element is stored
+        size = len(self.chain_space.public_heap)
+        gc_state = gc.isenabled()
+        records = [('new_a', None, '⊙', 1.0, 1.0, 0.5), (bulk_ids[0], None, '⊙', 1.0, 1.0, 0.5)]
+        try:
+            self.chain_space.add_evaluated_elements(records)
+            rejected = False
+        except ValueError:
+            rejected = True
+        print(f"Batch with a duplicate ID rejected: {rejected}, "
+              f"elements stored: {len(self.chain_space.public_heap) - size}, "
+              f"GC state unchanged: {gc.isenabled() == gc_state}")
+
+    def test_tunneling_shortcut(self) -> None:
+        """Test shortcut evaluation of tunneling patterns at insert time"""
+        self.print_header("8. TUNNELING SHORTCUT IN CHAIN SPACE")
+
+        test_cases = [
+            (0.5, 4.0, "Fractional"),
+            (3.0, 0.5, "Inverse fractional"),
+            (3.7, 1.1, "Inexact values"),
+            (1.0, -1.0, "Pole at Y ⊙ X"),
+        ]
+
+        literal_space = KMRChainSpace()
+        shortcut_space = KMRChainSpace(tunneling_shortcut=True)
+
+        print(f"\n{'Description':<20} {'Step by step':<25} {'Shortcut':<25} {'Expected (1/X)':<25} {'Status':<10}")
+        print("-" * 105)
+
+        for Y, X, desc in test_cases:
+            expected = 1.0 / X
+            literal = literal_space.get_chain_value(create_tunneling_chain(literal_space, Y, X))
+            shortcut = shortcut_space.get_chain_value(create_tunneling_chain(shortcut_space, Y, X))
+            status = "PASS" if shortcut == expected else "FAIL"
+            print(f"{desc:<20} {literal:<25.{self.precision}f} {shortcut:<25.{self.precision}f} "
+                  f"{expected:<25.{self.precision}f} {status:<10}")
+
+        print(f"\nShortcuts taken: {shortcut_space.tunneling_shortcuts} of {len(test_cases)} chains")
+
+    def test_interning(self) -> None:
+        """Test that tunneling chains with shared prefixes are stored once"""
+        self.print_header("9. INTERNED CHAIN PREFIXES")
+
+        plain_space = KMRChainSpace()
+        interned_space = KMRChainSpace(interning=True)
+
+        # 50 chains share the prefix 1 ⊙ 2 ⊙ 3 and differ only in the last step
+        results_match = True
+        for space in (plain_space, interned_space):
+            finals = []
+            for i in range(50):
+                element_id = space.add_element('⊙', 2.0, chain_value_before=1.0)
+                element_id = space.add_element('⊙', 3.0, parent_id=element_id)
+                element_id = space.add_element('⊘', float(i % 5), parent_id=element_id)
+                finals.append(space.get_chain_value(element_id))
+            if space is plain_space:
+                plain_finals = finals
+            else:
+                results_match = finals == plain_finals
+
+        stats = interned_space.interning_stats()
+        print(f"\nWithout interning: {len(plain_space.public_heap)} elements")
+        print(f"With interning:    {len(interned_space.public_heap)} elements, "
+              f"dedup ratio {stats['dedup_ratio']:.1f}, "
+              f"{stats['reused_elements']} reused, ~{stats['memory_saved_bytes']:,} bytes saved")
+        print(f"Chain values identical: {results_match}")
+
+        # A tunnel built twice on the same root is shared as well
+        first = create_tunneling_chain(interned_space, 2.0, 4.0)
+        second = create_tunneling_chain(interned_space, 2.0, 4.0)
+        print(f"Repeated tunnel 2 ⊙ 4 ⊘ 2⁻¹ reuses its elements: {first == second}")
+
+        # Keys are exact: parameter types and signed zeros are kept apart, NaNs are merged
+        space = KMRChainSpace(interning=True)
+        typed = {space.add_element('+', value, chain_value_before=1.0) for value in (1, 1.0, True)}
+        plus_zero = space.add_element('*', 0.0, chain_value_before=1.0)
+        minus_zero = space.add_element('*', -0.0, chain_value_before=1.0)
+        nan_steps = {space.add_element('⊙', 2.0, chain_value_before=float('nan')) for _ in range(3)}
+        print(f"\nParameters 1, 1.0, True: {len(typed)} elements; "
+              f"* 0.0 and * -0.0 distinct: {plus_zero != minus_zero} "
+              f"(value {space.get_chain_value(minus_zero)}); 3 steps after NaN stored as {len(nan_steps)}")
+
+        # Re-registering a handler invalidates interned results
+        before = space.add_element('+', 5.0, chain_value_before=1.0)
+        space.register_operation('+', lambda a, b: a + 2 * b)
+        after = space.add_element('+', 5.0, chain_value_before=1.0)
+        print(f"1 + 5 before and after re-registering '+': {space.get_chain_value(before)}, "
+              f"{space.get_chain_value(after)} (new element: {before != after})")
+
+    def test_instrumentation(self) -> None:
+        """Test hot-path statistics and the callback hook of KMRChainSpace"""
+        self.print_header("10. CHAIN SPACE INSTRUMENTATION")
+
+        # Prometheus-style counters fed by the callback hook
+        counters = {}
+
+        def on_event(event, operation, value):
+            key = (event, operation)
+            counters[key] = counters.get(key, 0) + value
+
+        space = KMRChainSpace(tunneling_shortcut=True)
+        space.enable_instrumentation(callback=on_event)
+
+        for Y, X in [(2.0, 3.0), (0.5, 4.0), (1.0, -1.0)]:
+            create_tunneling_chain(space, Y, X)
+        create_tunneling_chains_bulk(space, [2.0, 3.0, 5.0], [1.0, 2.0, 3.0])
+        try:
+            space.add_element('/', 0.0)
+        except ValueError:
+            pass
+
+        stats = space.instrumentation_stats()
+        print(f"\n{'Operation':<10} {'Calls':<8} {'Handler time':<16} {'Exceptions':<12} {'NaN':<6} {'Poles':<6}")
+        print("-" * 60)
+        for op, calls in stats['operations'].items():
+            handler_time = f"{stats['handler_time'][op] * 1e6:.1f} µs"
+            print(f"{op:<10} {calls:<8} {handler_time:<16} "
+                  f"{stats['exceptions'].get(op, 0):<12} {stats['nans'].get(op, 0):<6} {stats['poles'].get(op, 0):<6}")
+        print(f"\nIDs generated: {stats['ids_generated']} in {stats['id_generation_time'] * 1e6:.1f} µs")
+        print(f"Tunneling shortcuts: {stats['tunneling_shortcuts']} (single steps and bulk chains)")
+
+        consistent = (all(counters[('operation', op)] == seconds for op, seconds in stats['handler_time'].items()) and
+                      all(counters[('exception', op)] == n for op, n in stats['exceptions'].items()) and
+                      all(counters[('nan', op)] == n for op, n in stats['nans'].items()) and
+                      counters[('tunneling_shortcut', '⊘')] == stats['tunneling_shortcuts'])
+        print(f"Callback counters match the snapshot: {'PASS' if consistent else 'FAIL'}")
+
+        space.disable_instrumentation()
+        create_tunneling_chain(space, 2.0, 3.0)
+        print(f"After disable_instrumentation: enabled={space.instrumentation_stats()['enabled']}, "
+              f"shortcuts in total {space.tunneling_shortcuts}")
+
+    def test_chain_rewriting(self) -> None:
+        """Test the rewrite pass against literal evaluation through the chain space"""
+        self.print_header("11. CHAIN REWRITING")
+
+        # Paths with a tunnel at the start, in the middle, and after an arithmetic barrier
+        test_cases = [
+            (1.0, [('⊙', 2.0), ('⊙', 5.0), ('⊘', None), ('⊙', 0.5)], "Tunnel mid-path"),
+            (2.0, [('⊙', 3.0), ('⊘', None), ('⊙', 1.5), ('⊘', 0.25)], "Tunnel at start"),
+            (1.5, [('+', 0.5), ('*', 1.0), ('⊙', 4.0), ('⊘', None), ('-', 0.0)], "Tunnel after +, *"),
+            (0.5, [('⊙', 0.1), ('⊘', 0.3), ('+', 2.0), ('⊙', 0.7), ('⊘', 0.2)], "No tunnel"),
+        ]
+
+        space = KMRChainSpace()
+        print(f"\n{'Description':<20} {'Ops':<10} {'Tunnels':<9} {'Simplified':<25} {'Stored':<25} {'Status':<10}")
+        print("-" * 100)
+        for start, steps, desc in test_cases:
+            node = None
+            for op, value in steps:
+                if value is None:
+                    # Close a tunnel: parameter is the inverse of the value before the ⊙ step
+                    value = 1.0 / space.private_heap[node].chain_value_before
+                node = space.add_element(op, value, parent_id=node,
+                                         chain_value_before=start if node is None else None)
+            _, simplified_steps, stats = simplify_chain_path(space, node)
+            simplified = evaluate_chain_path(space, node)
+            stored = space.get_chain_value(node)
+            status = "PASS" if abs(simplified - stored) <= self.epsilon * abs(stored) else "FAIL"
+            print(f"{desc:<20} {stats['original_ops']} -> {stats['simplified_ops']:<5} {stats['tunnels']:<9} "
+                  f"{simplified:<25.{self.precision}f} {stored:<25.{self.precision}f} {status:<10}")
+
+        # Handlers registered on the space are used, and rules skip re-registered operations
+        space = KMRChainSpace()
+        space.register_operation('+', lambda a, b: a + 2 * b)
+        node = space.add_element('+', 0.0, chain_value_before=1.0)
+        node = space.add_element('+', 1.0, parent_id=node)
+        node = space.add_element('⊙', 2.0, parent_id=node)
+        print(f"\nCustom '+' handler: simplified {evaluate_chain_path(space, node)!r}, "
+              f"stored {space.get_chain_value(node)!r}")
+
+        # numpy scalars are numbers for the rewrite rules
+        _, steps, stats = simplify_steps([('⊙', np.int64(2)), ('⊘', np.float64(0.5)), ('+', np.int64(0))], 1.0)
+        print(f"1 ⊙ int64(2) ⊘ float64(0.5) + int64(0)  ->  {steps}, cancelled {stats['cancelled']}")
+
+        r = benchmark_rewrite(10000, chains=10)
+        print(f"\nMixed chains of 10000 steps: ops {r['literal_ops']} -> {r['simplified_ops']}, "
+              f"max rel error {r['literal_max_rel_error']:.2e} -> {r['simplified_max_rel_error']:.2e}")
+        print(f"Literal {r['literal_seconds']:.4f} s, simplify + evaluate {r['simplified_seconds']:.4f} s, "
+              f"simplified faster: {r['simplified_seconds'] < r['literal_seconds']}")
+
     def run_all_tests(self) -> None:
         """Run all tunneling tests"""
         print("=" * 70)
@@ -384,6 +611,11 @@ class KMRTunnelingTests:
             self.test_complex_chain_tunneling,
             self.test_tunneling_property_verification,
             self.test_chain_space_structure_analysis,
+            self.test_batched_tunneling,
+            self.test_tunneling_shortcut,
+            self.test_interning,
+            self.test_instrumentation,
+            self.test_chain_rewriting,
         ]
 
         for i, test in enumerate(tests, 1):
@@ -403,6 +635,8 @@ class KMRTunnelingTests:
         print("3. Chain space maintains consistent structure for all operations")
         print("4. Tunneling works correctly through chains of various complexities")
         print("5. The property is independent of chain content (as expected)")
+        print("6. Opt-in instrumentation counts handler calls, failures, NaN poles and shortcuts")
+        print("7. The rewrite pass collapses tunnels anywhere on a chain path")
 
 
 def main():